@@ -0,0 +1,46 @@
+import argparse
+import time
+
+import numpy as np
+
+from core.batch import boards_to_array, evaluate_batch
+from benchmarks.common import random_positions
+from utils.cache import cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of the NumPy batch evaluator.")
+    parser.add_argument("--positions", type=int, default=2000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    for must_jump in (True, False):
+        boards = [board for board, color in random_positions(args.positions, must_jump, seed=12)]
+        expected = []
+        for board in boards:
+            cache.clear()
+            expected.append(board.evaluate(must_jump))
+        squares = boards_to_array(boards)
+        grids = np.array([board.board for board in boards], dtype=np.int8)
+        for name, positions in (("N x 32", squares), ("N x 8 x 8", grids)):
+            if not np.allclose(evaluate_batch(positions, must_jump), expected, rtol=0, atol=1e-9):
+                raise AssertionError(f"batch evaluation disagrees with Board.evaluate ({name}, must_jump={must_jump})")
+        print(f"Batch evaluation matches Board.evaluate on {len(boards)} positions (must_jump={must_jump}).")
+
+    start = time.perf_counter()
+    for board in boards:
+        cache.clear()
+        board.evaluate(board.must_jump)
+    elapsed = time.perf_counter() - start
+    print(f"   Board.evaluate: {len(boards) / elapsed:,.0f} positions/s")
+
+    for size in args.sizes:
+        positions = np.resize(squares, (size, 32))
+        start = time.perf_counter()
+        evaluate_batch(positions, True)
+        elapsed = time.perf_counter() - start
+        print(f"N = {size:>9,}: {elapsed:.2f}s, {size / elapsed:,.0f} positions/s")
+
+
+if __name__ == "__main__":
+    main()
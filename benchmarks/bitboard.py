@@ -0,0 +1,65 @@
+import argparse
+
+from core.bitboard import BitBoard
+from core.moves import legal_moves, opponent, play
+from core.zobrist import hash_board
+from benchmarks.common import random_positions, timed_search
+from utils.cache import cache
+
+
+def verify(positions):
+    checked = 0
+    for board, color in positions:
+        bitboard = BitBoard.from_board(board)
+        for must_jump in (True, False):
+            for side in (color, opponent(color)):
+                expected = board.get_all_moves(side, must_jump)
+                actual = bitboard.get_all_moves(side, must_jump)
+                if [list(d.items()) for d in expected] != [list(d.items()) for d in actual]:
+                    raise AssertionError(f"move lists differ for {side} (must_jump={must_jump}):\n{board.board}")
+            cache.clear()
+            expected = board.evaluate(must_jump)
+            cache.clear()
+            if bitboard.evaluate(must_jump) != expected:
+                raise AssertionError(f"evaluation differs (must_jump={must_jump}):\n{board.board}")
+        for option in legal_moves(board, color, board.must_jump):
+            after = board.copy()
+            play(after, option)
+            bitboard_after = bitboard.copy()
+            play(bitboard_after, option)
+            if bitboard_after.to_grid() != after.board or bitboard_after.red_kings != after.red_kings \
+                    or bitboard_after.blue_pieces != after.blue_pieces:
+                raise AssertionError(f"play differs for {option}:\n{board.board}")
+            if not bitboard_after.hash == after.hash == hash_board(after.board, after.turn, after.must_jump):
+                raise AssertionError(f"incremental hash differs for {option}:\n{board.board}")
+        checked += 1
+    return checked
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare BitBoard against Board.")
+    parser.add_argument("--positions", type=int, default=2000)
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--searches", type=int, default=3)
+    args = parser.parse_args()
+
+    checked = 0
+    for must_jump in (True, False):
+        checked += verify(random_positions(args.positions // 2, must_jump, seed=1))
+    print(f"Verified moves, evaluation, play and hashing on {checked} positions.")
+
+    red_to_move = [board for board, color in random_positions(60, True, seed=2, max_plies=12) if color == "RED"]
+    for board in red_to_move[:args.searches]:
+        results = {}
+        for use_bitboard in (False, True):
+            results[use_bitboard] = timed_search(board, args.depth, use_bitboard)
+        for use_bitboard, (evaluation, best_move, nodes, elapsed) in results.items():
+            name = "BitBoard" if use_bitboard else "Board"
+            print(f"{name:>8}: depth {args.depth}, {nodes} nodes, {elapsed:.2f}s, "
+                  f"{nodes / elapsed:.0f} nodes/s, eval {evaluation:.2f}, move {best_move}")
+        if results[True][:3] != results[False][:3]:
+            raise AssertionError("search results differ between Board and BitBoard")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from core.board import Board
+from core.moves import legal_moves, opponent, play
+from game.ai import CheckersAI
+from game.book import add_searches, write_book
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a small opening book and measure lookups against search.")
+    parser.add_argument("--plies", type=int, default=3)
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--games", type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "book.bin")
+    entries = {}
+    searcher = CheckersAI(time_budget_ms=None)
+    for must_jump in (True, False):
+        add_searches(entries, searcher, must_jump, args.plies, args.depth, log=lambda message: None)
+    print(f"Built a book of {write_book(entries, path)} moves.")
+
+    booked = CheckersAI(time_budget_ms=None, book_path=path)
+    plain = CheckersAI(time_budget_ms=None)
+    rng = random.Random(16)
+    elapsed = {"book": 0.0, "search": 0.0}
+    for _ in range(args.games):
+        board = Board(rng.choice((True, False)))
+        color = "BLUE"
+        for ply in range(args.plies + 1):
+            search_board = booked.search_board(board)
+            start = time.perf_counter()
+            book_move = booked.search(search_board, args.depth)[1]
+            elapsed["book"] += time.perf_counter() - start
+            start = time.perf_counter()
+            plain.search(plain.search_board(board), args.depth)
+            elapsed["search"] += time.perf_counter() - start
+            if book_move not in legal_moves(board, color, True):
+                raise AssertionError(f"book move {book_move} is not legal here:\n{board.board}")
+            play(board, rng.choice(legal_moves(board, color, board.must_jump)))
+            color = opponent(color)
+    book = booked.book
+    print(f"Book hit rate {book.hit_rate():.0%} ({book.hits}/{book.lookups}); "
+          f"{elapsed['book']:.2f}s with the book against {elapsed['search']:.2f}s searching every move")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import random
+import time
+
+from core.board import Board
+from core.moves import legal_moves, opponent, play
+from game.ai import CheckersAI
+from utils.cache import cache
+
+# Benchmarks measure the search, so leave the on-disk evaluation store out of it.
+cache.store = None
+
+
+def random_positions(count, must_jump, seed=0, max_plies=80):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = Board(must_jump)
+        color = "BLUE"
+        for _ in range(max_plies):
+            options = legal_moves(board, color, must_jump)
+            if not options:
+                break
+            positions.append((board.copy(), color))
+            play(board, rng.choice(options))
+            color = opponent(color)
+    return positions[:count]
+
+
+def timed_search(board, depth, use_bitboard):
+    cache.clear()
+    ai = CheckersAI(use_bitboard=use_bitboard)
+    start = time.perf_counter()
+    evaluation, best_move = ai.minimax(ai.search_board(board), depth, float('-inf'), float('inf'))
+    return evaluation, best_move, ai.nodes, time.perf_counter() - start
@@ -0,0 +1,105 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from core.bitboard import BOTTOM_ROW, TOP_ROW, BitBoard
+from game.ai import CheckersAI
+from game.endgame import EndgameDatabase, build, signatures
+import benchmarks.common  # noqa: F401  (detaches the on-disk evaluation store)
+
+
+def random_position(rng, signature):
+    squares = rng.sample(range(32), sum(signature))
+    red = blue = kings = 0
+    for count, is_red, is_king in zip(signature, (True, True, False, False), (False, True, False, True)):
+        for _ in range(count):
+            bit = 1 << squares.pop()
+            if is_red:
+                red |= bit
+            else:
+                blue |= bit
+            if is_king:
+                kings |= bit
+    # Men cannot stand on their promotion row.
+    if red & ~kings & BOTTOM_ROW or blue & ~kings & TOP_ROW:
+        return random_position(rng, signature)
+    return red, blue, kings, rng.choice(("RED", "BLUE"))
+
+
+def mirror(mask):
+    return sum(1 << (31 - square) for square in range(32) if mask >> square & 1)
+
+
+def expected_value(database, red, blue, kings, turn):
+    # Negamax over one ply of database values, with distances counted in plies.
+    board = BitBoard(True, red, blue, kings, turn)
+    moves, jumps = board.get_all_moves(turn, True)
+    child_values = []
+    for start_pos, move_list in (jumps if jumps else moves).items():
+        for move_data in move_list:
+            undo = board.make_move(start_pos, move_data, bool(jumps))
+            if board.red and board.blue:
+                child_values.append(database.probe(board.red, board.blue, board.kings, board.turn))
+            else:
+                child_values.append(-1)
+            board.unmake_move(undo)
+    losses = [-value - 1 for value in child_values if value < 0]
+    if losses:
+        return min(losses) + 2
+    if all(value > 0 for value in child_values):
+        return -(max([value - 1 for value in child_values], default=-1) + 2)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a small endgame database and check it.")
+    parser.add_argument("--pieces", type=int, default=3)
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--searches", type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "endgame.db")
+    start = time.perf_counter()
+    build(args.pieces, path, log=lambda message: None)
+    print(f"Built the {args.pieces}-piece database in {time.perf_counter() - start:.1f}s "
+          f"({os.path.getsize(path) / 1024:.0f} KiB)")
+
+    database = EndgameDatabase(path)
+    rng = random.Random(15)
+    order = signatures(args.pieces)
+    for _ in range(args.samples):
+        red, blue, kings, turn = random_position(rng, rng.choice(order))
+        value = database.probe(red, blue, kings, turn)
+        if value != expected_value(database, red, blue, kings, turn):
+            raise AssertionError(f"inconsistent entry {value} for red={red:#x} blue={blue:#x} kings={kings:#x} {turn}")
+        other = "BLUE" if turn == "RED" else "RED"
+        if value != database.probe(mirror(blue), mirror(red), mirror(kings), other):
+            raise AssertionError(f"colour-mirrored entry differs for red={red:#x} blue={blue:#x} kings={kings:#x}")
+    print(f"Checked {args.samples} entries against their successors and colour mirrors.")
+
+    searchers = {"without": CheckersAI(time_budget_ms=None), "with": CheckersAI(time_budget_ms=None, endgame_path=path)}
+    nodes = dict.fromkeys(searchers, 0)
+    elapsed = dict.fromkeys(searchers, 0.0)
+    agreed = 0
+    for _ in range(args.searches):
+        red, blue, kings, turn = random_position(rng, rng.choice(order[-4:]))
+        for name, ai in searchers.items():
+            ai.reset_counters()
+            begin = time.perf_counter()
+            evaluation = ai.search(BitBoard(True, red, blue, kings, turn), 8)[0]
+            elapsed[name] += time.perf_counter() - begin
+            nodes[name] += ai.nodes
+        value = database.probe(red, blue, kings, turn)
+        if value and (evaluation > 0) == ((value > 0) == (turn == "RED")):
+            agreed += 1
+    for name in searchers:
+        print(f"Depth-8 search {name} the database: {nodes[name]} nodes, {elapsed[name]:.2f}s")
+    print(f"{agreed} of {args.searches} positions were decided and scored with the right sign.")
+    database.close()
+    searchers["with"].endgame.close()
+
+
+if __name__ == "__main__":
+    main()
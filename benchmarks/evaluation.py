@@ -0,0 +1,72 @@
+import argparse
+import time
+
+from core.board import Board
+from core.moves import is_jump_move, legal_moves
+from core.piece import Piece
+from benchmarks.common import random_positions
+from utils.cache import cache
+
+
+def rescan_evaluate(board, must_jump):
+    # The evaluation as it was before the running totals: a full scan plus move generation.
+    red_score = board.red_pieces + (board.red_kings * Board.KING_VALUE)
+    blue_score = board.blue_pieces + (board.blue_kings * Board.KING_VALUE)
+    for row in range(8):
+        for col in range(8):
+            piece = board.board[row][col]
+            if piece != Piece.EMPTY:
+                piece_score = Board._evaluate_piece_position(piece, row, col)
+                if Piece.is_red(piece):
+                    red_score += piece_score
+                else:
+                    blue_score += piece_score
+    for color in ("RED", "BLUE"):
+        moves, jumps = board.get_all_moves(color, must_jump)
+        mobility = sum(len(move_list) for move_list in moves.values()) + sum(len(jump_list) for jump_list in jumps.values())
+        if color == "RED":
+            red_score += mobility * Board.MOBILITY_WEIGHT
+        else:
+            blue_score += mobility * Board.MOBILITY_WEIGHT
+    return red_score - blue_score
+
+
+def verify(positions):
+    for board, color in positions:
+        for must_jump in (True, False):
+            cache.clear()
+            if board.evaluate(must_jump) != rescan_evaluate(board, must_jump):
+                raise AssertionError(f"incremental evaluation differs (must_jump={must_jump}):\n{board.board}")
+        for move in legal_moves(board, color, board.must_jump):
+            start, move_data = move
+            undo = board.make_move(start, move_data, is_jump_move(move))
+            cache.clear()
+            if board.evaluate(board.must_jump) != rescan_evaluate(board, board.must_jump):
+                raise AssertionError(f"evaluation differs after {start} -> {move_data}:\n{board.board}")
+            board.unmake_move(undo)
+    return len(positions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare incremental and rescanning evaluation.")
+    parser.add_argument("--positions", type=int, default=2000)
+    args = parser.parse_args()
+
+    positions = []
+    for must_jump in (True, False):
+        positions += random_positions(args.positions // 2, must_jump, seed=11)
+    print(f"Verified incremental evaluation on {verify(positions)} positions.")
+
+    boards = [board for board, color in positions]
+    for name, evaluate in (("rescan", rescan_evaluate), ("incremental", Board.evaluate)):
+        cache.clear()
+        cache.max_entries = 0
+        start = time.perf_counter()
+        for board in boards:
+            evaluate(board, board.must_jump)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>11}: {len(boards)} leaves, {elapsed * 1e6 / len(boards):.1f} us per leaf")
+
+
+if __name__ == "__main__":
+    main()
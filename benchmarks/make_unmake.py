@@ -0,0 +1,92 @@
+import argparse
+import pickle
+import time
+
+from core.bitboard import BitBoard
+from core.moves import is_jump_move, legal_moves, play
+from game.ai import CheckersAI
+from benchmarks.common import random_positions
+from utils.cache import cache
+
+
+class CopySearchAI(CheckersAI):
+    # The search as it was before make/unmake: one board copy per child.
+
+    def minimax(self, board, depth, alpha, beta, ply=0):
+        self.nodes += 1
+        maximizer = board.turn == "RED"
+        if depth == 0:
+            return board.evaluate(board.must_jump), None
+        moves, jumps = board.get_all_moves("RED" if maximizer else "BLUE", board.must_jump)
+        if not moves and not jumps:
+            return (ply - self.WIN_SCORE if maximizer else self.WIN_SCORE - ply), None
+        best_eval = float('-inf') if maximizer else float('inf')
+        best_move = None
+        for start_pos, move_list in (jumps if jumps else moves).items():
+            for move_data in move_list:
+                board_copy = board.copy()
+                if jumps:
+                    board_copy.play_jump(move_data)
+                else:
+                    board_copy.play_move(start_pos, move_data)
+                evaluation = self.minimax(board_copy, depth - 1, alpha, beta, ply + 1)[0]
+                if maximizer and evaluation > best_eval or not maximizer and evaluation < best_eval:
+                    best_eval = evaluation
+                    best_move = (start_pos, move_data)
+                if maximizer:
+                    alpha = max(alpha, evaluation)
+                else:
+                    beta = min(beta, evaluation)
+                if beta <= alpha:
+                    return best_eval, best_move
+        return best_eval, best_move
+
+
+def verify(positions):
+    checked = 0
+    for board, color in positions:
+        for search_board in (board, BitBoard.from_board(board)):
+            before = pickle.dumps(vars(search_board))
+            for move in legal_moves(search_board, color, board.must_jump):
+                start, move_data = move
+                is_jump = is_jump_move(move)
+                played = search_board.copy()
+                undo = search_board.make_move(start, move_data, is_jump)
+                search_board.unmake_move(undo)
+                if pickle.dumps(vars(search_board)) != before:
+                    raise AssertionError(f"unmake did not restore the board after {move_data}:\n{board.board}")
+                play(played, move)
+                undo = search_board.make_move(start, move_data, is_jump)
+                if pickle.dumps(vars(search_board)) != pickle.dumps(vars(played)):
+                    raise AssertionError(f"make_move differs from play for {move_data}:\n{board.board}")
+                search_board.unmake_move(undo)
+            checked += 1
+    return checked
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check make/unmake and compare it with copy-based search.")
+    parser.add_argument("--positions", type=int, default=3000)
+    parser.add_argument("--depth", type=int, default=6)
+    args = parser.parse_args()
+
+    checked = 0
+    for must_jump in (True, False):
+        checked += verify(random_positions(args.positions // 2, must_jump, seed=3))
+    print(f"make/unmake restored {checked} boards byte-for-byte.")
+
+    board = random_positions(2, True)[1][0]
+    for use_bitboard in (False, True):
+        for ai_class in (CopySearchAI, CheckersAI):
+            cache.clear()
+            ai = ai_class(use_bitboard=use_bitboard, move_ordering=False, tt_size_mb=0, pvs=False,
+                          selective=False)
+            start = time.perf_counter()
+            evaluation, best_move = ai.minimax(ai.search_board(board), args.depth, float('-inf'), float('inf'))
+            elapsed = time.perf_counter() - start
+            name = ("BitBoard" if use_bitboard else "Board") + (" copy" if ai_class is CopySearchAI else " make/unmake")
+            print(f"{name:>20}: {ai.nodes} nodes, {elapsed:.2f}s, {ai.nodes / elapsed:.0f} nodes/s, eval {evaluation:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+import time
+
+from benchmarks.common import random_positions
+from game.ai import CheckersAI
+from utils.cache import cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ordered and unordered search.")
+    parser.add_argument("--positions", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=7)
+    args = parser.parse_args()
+
+    boards = [board for board, color in random_positions(args.positions * 10, True, seed=6) if color == "RED"]
+    boards = boards[::max(1, len(boards) // args.positions)][:args.positions]
+    for move_ordering in (False, True):
+        nodes = cutoffs = first_move_cutoffs = 0
+        elapsed = 0.0
+        scores = []
+        for board in boards:
+            cache.clear()
+            ai = CheckersAI(time_budget_ms=None, move_ordering=move_ordering, selective=False)
+            start = time.perf_counter()
+            evaluation, best_move, depth = ai.search(ai.search_board(board), args.depth)
+            elapsed += time.perf_counter() - start
+            scores.append(evaluation)
+            nodes += ai.nodes
+            cutoffs += ai.cutoffs
+            first_move_cutoffs += ai.first_move_cutoffs
+        name = "ordered" if move_ordering else "unordered"
+        print(f"{name:>9}: {nodes} nodes, {elapsed:.2f}s, {first_move_cutoffs}/{cutoffs} "
+              f"({first_move_cutoffs / max(1, cutoffs):.0%}) cutoffs on the first move")
+        if move_ordering and scores != unordered_scores:
+            raise AssertionError("move ordering changed search scores")
+        unordered_scores = scores
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import argparse
+import time
+
+from core.board import Board
+from core.piece import is_valid_position, Piece
+from benchmarks.common import random_positions
+
+
+class LegacyBoard(Board):
+    # Move generation as it was before the precomputed tables.
+
+    def get_moves_for_piece(self, piece, row, col):
+        moves = []
+        directions = []
+        if piece == Piece.RED:
+            directions.extend([(1, -1), (1, 1)])
+        elif piece == Piece.BLUE:
+            directions.extend([(-1, -1), (-1, 1)])
+        elif Piece.is_king(piece):
+            directions.extend([(1, -1), (1, 1), (-1, -1), (-1, 1)])
+        for dr, dc in directions:
+            new_row, new_col = row + dr, col + dc
+            if is_valid_position(new_row, new_col) and self.board[new_row][new_col] == Piece.EMPTY:
+                moves.append((new_row, new_col))
+
+        return moves
+
+    def get_jumps_for_piece(self, piece, row, col):
+        directions = []
+        if Piece.is_red(piece):
+            directions.extend([(1, -1), (1, 1)])
+        if Piece.is_blue(piece):
+            directions.extend([(-1, -1), (-1, 1)])
+        if Piece.is_king(piece):
+            if Piece.is_red(piece):
+                directions.extend([(-1, -1), (-1, 1)])
+            else:
+                directions.extend([(1, -1), (1, 1)])
+
+        def find_jumps(row, col, current_path, current_piece):
+            found_jumps = []
+            for dr, dc in directions:
+                middle_row, middle_col = row + dr, col + dc
+                jump_row, jump_col = row + 2 * dr, col + 2 * dc
+                if is_valid_position(middle_row, middle_col) and is_valid_position(jump_row, jump_col):
+                    middle_piece = self.board[middle_row][middle_col]
+                    new_pos = (jump_row, jump_col)
+                    if Piece.is_blue(current_piece):
+                        if Piece.is_red(middle_piece) and self.board[jump_row][jump_col] == Piece.EMPTY:
+                            if new_pos not in current_path:
+                                next_path = current_path + [new_pos]
+
+                                if jump_row == 0 and not Piece.is_king(current_piece):
+                                    new_piece = Piece.BLUE_KING
+                                else:
+                                    new_piece = current_piece
+
+                                sub_jumps = find_jumps(jump_row, jump_col, next_path, new_piece)
+                                if sub_jumps:
+                                    found_jumps.extend(sub_jumps)
+                                else:
+                                    found_jumps.append(next_path)
+
+                    elif Piece.is_red(current_piece):
+                        if Piece.is_blue(middle_piece) and self.board[jump_row][jump_col] == Piece.EMPTY:
+                            if new_pos not in current_path:
+                                next_path = current_path + [new_pos]
+                                if jump_row == 7 and not Piece.is_king(current_piece):
+                                    new_piece = Piece.RED_KING
+                                else:
+                                    new_piece = current_piece
+
+                                sub_jumps = find_jumps(jump_row, jump_col, next_path, new_piece)
+                                if sub_jumps:
+                                    found_jumps.extend(sub_jumps)
+                                else:
+                                    found_jumps.append(next_path)
+            return found_jumps
+
+        all_jumps = find_jumps(row, col, [(row, col)], piece)
+        return all_jumps
+
+
+def legacy(board):
+    legacy_board = LegacyBoard.__new__(LegacyBoard)
+    legacy_board.__dict__.update(board.copy().__dict__)
+    return legacy_board
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare table-driven move generation with the original.")
+    parser.add_argument("--positions", type=int, default=4000)
+    args = parser.parse_args()
+
+    boards = []
+    for must_jump in (True, False):
+        boards += [board for board, color in random_positions(args.positions // 2, must_jump, seed=17)]
+    legacy_boards = [legacy(board) for board in boards]
+    for board, legacy_board in zip(boards, legacy_boards):
+        for row in range(8):
+            for col in range(8):
+                piece = board.board[row][col]
+                if board.get_all_moves_for_piece(piece, row, col) != legacy_board.get_all_moves_for_piece(piece, row, col):
+                    raise AssertionError(f"moves differ for the piece at {(row, col)}:\n{board.board}")
+    print(f"Per-piece moves and jump sequences match on {len(boards)} positions.")
+
+    for name, candidates in (("original", legacy_boards), ("tables", boards)):
+        start = time.perf_counter()
+        for board in candidates:
+            board.get_all_moves("RED", board.must_jump)
+            board.get_all_moves("BLUE", board.must_jump)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>8}: {2 * len(candidates) / elapsed:,.0f} get_all_moves calls/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import time
+
+from core.bitboard import BitBoard
+from game.parallel import ParallelSearch
+from benchmarks.common import random_positions
+from game.ai import CheckersAI
+from utils.cache import cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling of the parallel root search.")
+    parser.add_argument("--positions", type=int, default=6)
+    parser.add_argument("--depth", type=int, default=7)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    boards = [board for board, color in random_positions(args.positions * 10, True, seed=8) if color == "RED"]
+    boards = boards[::max(1, len(boards) // args.positions)][:args.positions]
+
+    serial = []
+    ai = CheckersAI(time_budget_ms=None, selective=False)
+    for board in boards:
+        serial.append(ai.minimax(ai.search_board(board), args.depth, float('-inf'), float('inf'))[0])
+
+    reference = None
+    for workers in args.workers:
+        # Workers fork from this process, so they start with the same empty cache.
+        cache.clear()
+        search = ParallelSearch(workers, selective=False)
+        search._ensure_pool()
+        results = []
+        for board in boards:
+            evaluation, best_move, searched = search.search_root(BitBoard.from_board(board), args.depth)
+            results.append((evaluation, best_move))
+        search.close()
+        if [evaluation for evaluation, best_move in results] != serial:
+            raise AssertionError(f"{workers} workers disagree with the serial search score")
+        if reference is not None and results != reference:
+            raise AssertionError(f"{workers} workers chose different moves")
+        reference = results
+    print(f"A single full-width depth-{args.depth} iteration matches the serial search with every worker count.")
+
+    # Scaling is measured on the search the game runs: iterative deepening with the selective search,
+    # against the serial CheckersAI. Repeated parallel runs must give the same moves and scores.
+    baseline = None
+    for workers in args.workers:
+        elapsed = float('inf')
+        reference = None
+        for _ in range(args.repeats):
+            cache.clear()
+            ai = CheckersAI(time_budget_ms=None, workers=workers)
+            if workers > 1:
+                # Starting the worker processes is not part of a search.
+                ai.root_search(BitBoard(True), 1)
+            ai.reset_counters()
+            start = time.perf_counter()
+            results = [ai.search(BitBoard.from_board(board), args.depth)[:2] for board in boards]
+            elapsed = min(elapsed, time.perf_counter() - start)
+            nodes = ai.nodes
+            ai.close()
+            if reference is not None and results != reference:
+                raise AssertionError(f"{workers} workers gave a different result on a repeated run")
+            reference = results
+        baseline = baseline or elapsed
+        name = "serial" if workers == 1 else f"{workers} workers"
+        print(f"{name:>10}: {elapsed:.2f}s, {nodes} nodes, {baseline / elapsed:.2f}x the serial search "
+              f"({args.repeats} runs agree)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from core.board import Board
+from core.moves import legal_moves, play
+from game.ai import CheckersAI
+from game.worker import SearchWorker
+from utils.cache import cache
+
+
+def run(pondering, args):
+    cache.clear()
+    rng = random.Random(23)
+    ai = CheckersAI(time_budget_ms=args.time_budget_ms)
+    worker = SearchWorker(ai)
+    board = Board(True)
+    latencies = []
+    hits = 0
+    for _ in range(args.moves):
+        options = legal_moves(board, board.turn, board.must_jump)
+        if not options:
+            break
+        # The player takes their time, and plays the move the bot expects as often as asked.
+        time.sleep(args.human_ms / 1000)
+        reply = ai.expected_reply(ai.search_board(board))
+        expected = [option for option in options if option == reply]
+        option = expected[0] if expected and rng.random() < args.hit_rate else rng.choice(options)
+        hits += bool(expected) and option is expected[0]
+        play(board, option)
+        if not legal_moves(board, board.turn, board.must_jump):
+            break
+        start = time.perf_counter()
+        worker.start(board)
+        while (result := worker.poll()) is None:
+            time.sleep(0.001)
+        latencies.append(time.perf_counter() - start)
+        ai.play(board, result[1])
+        if pondering:
+            worker.ponder(board)
+    worker.cancel()
+    return latencies, hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bot reply latency with and without pondering.")
+    parser.add_argument("--moves", type=int, default=15)
+    parser.add_argument("--time-budget-ms", type=int, default=300)
+    parser.add_argument("--human-ms", type=int, default=500, help="how long the simulated player thinks")
+    parser.add_argument("--hit-rate", type=float, default=0.5, help="how often the player plays the expected reply")
+    args = parser.parse_args()
+
+    for pondering in (False, True):
+        with contextlib.redirect_stdout(io.StringIO()):
+            latencies, hits = run(pondering, args)
+        name = "pondering" if pondering else "cold"
+        latencies.sort()
+        print(f"{name:>9}: mean {sum(latencies) / len(latencies) * 1000:.0f} ms, median "
+              f"{latencies[len(latencies) // 2] * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms over "
+              f"{len(latencies)} replies ({hits} played the expected move)")
+
+
+if __name__ == "__main__":
+    main()
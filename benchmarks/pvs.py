@@ -0,0 +1,47 @@
+import argparse
+import json
+import time
+
+from core.bitboard import BitBoard
+from game.ai import CheckersAI
+from benchmarks.suite import CORPUS_FILE
+from utils.cache import cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare principal variation search with plain alpha-beta.")
+    parser.add_argument("--depth", type=int, default=7)
+    args = parser.parse_args()
+
+    with open(CORPUS_FILE) as file:
+        corpus = json.load(file)
+    totals = {}
+    results = {}
+    for pvs in (False, True):
+        nodes = 0
+        elapsed = 0.0
+        results[pvs] = []
+        for entry in corpus:
+            for must_jump in (True, False):
+                cache.clear()
+                ai = CheckersAI(time_budget_ms=None, pvs=pvs, selective=False)
+                board = BitBoard(must_jump, entry["red"], entry["blue"], entry["kings"], entry["turn"])
+                start = time.perf_counter()
+                evaluation, best_move, depth = ai.search(board, args.depth)
+                elapsed += time.perf_counter() - start
+                nodes += ai.nodes
+                results[pvs].append((entry["name"], must_jump, evaluation, best_move))
+        totals[pvs] = nodes
+        name = "PVS" if pvs else "alpha-beta"
+        print(f"{name:>10}: {nodes} nodes, {elapsed:.2f}s")
+    moves_differ = 0
+    for (name, must_jump, plain, plain_move), (_, _, searched, searched_move) in zip(results[False], results[True]):
+        if abs(plain - searched) > 1e-9:
+            raise AssertionError(f"{name} (must_jump={must_jump}): PVS scored {searched}, alpha-beta {plain}")
+        moves_differ += plain_move != searched_move
+    print(f"Same scores on {len(results[True])} depth-{args.depth} searches; {moves_differ} picked a different "
+          f"move of equal score. PVS searched {totals[True] / totals[False]:.0%} of the alpha-beta nodes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import os
+import time
+
+# Render off-screen so the benchmark runs without a display.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from core.board import Board  # noqa: E402
+from ui.gui import CheckersGUI  # noqa: E402
+
+
+class Unpaced:
+    # Stands in for the GUI clock so frames are not held to 60 fps.
+
+    def tick(self, framerate=0):
+        return 0
+
+
+def frames(gui, count, message=lambda frame: ""):
+    start = time.process_time()
+    for frame in range(count):
+        gui.render(message(frame))
+    return (time.process_time() - start) / count * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU time per GUI frame, full redraw against cached rendering.")
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    screens = {}
+    for cached_rendering in (False, True):
+        board = Board(True)
+        gui = CheckersGUI(board, True, cached_rendering)
+        gui.clock = Unpaced()
+        name = "cached" if cached_rendering else "full redraw"
+        idle = frames(gui, args.frames)
+        thinking = frames(gui, args.frames, lambda frame: f"Bot is thinking... depth 7, {frame * 1000} nodes")
+        gui.selected_piece = (5, 0)
+        gui.valid_moves = [(4, 1)]
+        selecting = frames(gui, args.frames)
+        board.play_move((5, 0), (4, 1))
+        gui.selected_piece = None
+        gui.valid_moves = []
+        gui.render()
+        screens[cached_rendering] = pygame.image.tostring(gui.screen, "RGB")
+        print(f"{name:>11}: idle {idle:.3f} ms, progress message {thinking:.3f} ms, "
+              f"selection {selecting:.3f} ms CPU per frame")
+        gui.quit()
+    if screens[False] != screens[True]:
+        raise AssertionError("cached rendering differs from the full redraw")
+    print("Both modes produce the same final frame.")
+
+
+if __name__ == "__main__":
+    main()
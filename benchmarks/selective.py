@@ -0,0 +1,62 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from core.bitboard import BitBoard
+from game.ai import CheckersAI
+from game.selfplay import run_matches
+from benchmarks.suite import CORPUS_FILE
+from utils.cache import cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nodes and playing strength of the selective search.")
+    parser.add_argument("--depth", type=int, default=7)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--time-budget-ms", type=int, default=None,
+                        help="play the match on a time budget instead of the fixed depth schedule")
+    args = parser.parse_args()
+
+    with open(CORPUS_FILE) as file:
+        corpus = json.load(file)
+    totals = {}
+    for selective in (False, True):
+        nodes = 0
+        elapsed = 0.0
+        for entry in corpus:
+            for must_jump in (True, False):
+                cache.clear()
+                ai = CheckersAI(time_budget_ms=None, selective=selective)
+                board = BitBoard(must_jump, entry["red"], entry["blue"], entry["kings"], entry["turn"])
+                start = time.perf_counter()
+                ai.search(board, args.depth)
+                elapsed += time.perf_counter() - start
+                nodes += ai.nodes
+        totals[selective] = nodes
+        name = "selective" if selective else "full-width"
+        print(f"{name:>10}: {nodes} nodes, {elapsed:.2f}s over {2 * len(corpus)} depth-{args.depth} searches")
+    print(f"The selective search visited {totals[True] / totals[False]:.0%} of the full-width nodes.")
+
+    # Player A searches selectively, player B full-width, with the same depth schedule or budget.
+    players = {"A": {"time_budget_ms": args.time_budget_ms, "workers": 1},
+               "B": {"time_budget_ms": args.time_budget_ms, "workers": 1, "selective": False}}
+    output = os.path.join(tempfile.mkdtemp(), "selective.jsonl")
+    start = time.perf_counter()
+    results = run_matches(players, args.games, output, processes=1, max_plies=150)
+    nodes = {"A": [], "B": []}
+    with open(output) as file:
+        for line in file:
+            game = json.loads(line)
+            for entry in game["moves"]:
+                if "nodes" in entry:
+                    nodes[game["red"] if entry["side"] == "RED" else game["blue"]].append(entry["nodes"])
+    print(f"{args.games} games in {time.perf_counter() - start:.0f}s: selective won {results['A']}, "
+          f"full-width won {results['B']}, {results['draw']} drawn.")
+    for player, name in (("A", "selective"), ("B", "full-width")):
+        print(f"{name:>10}: {sum(nodes[player]) / max(1, len(nodes[player])):.0f} nodes per move")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter so every measurement starts with nothing imported.
+CHILD = """
+import json, time
+start = time.perf_counter()
+import game.logic
+imported = time.perf_counter()
+from game.logic import GameLogic
+game = GameLogic(True)
+game.gui.render()
+first_frame = time.perf_counter()
+from utils.cache import cache
+while cache.store is None and cache.incoming is None:
+    time.sleep(0.001)
+cache_ready = time.perf_counter()
+game.gui.quit()
+print(json.dumps({"import_ms": (imported - start) * 1000, "first_frame_ms": (first_frame - start) * 1000,
+                  "cache_ready_ms": (cache_ready - start) * 1000}))
+"""
+
+PYGAME_INIT = """
+import json, sys, time
+import pygame
+start = time.perf_counter()
+if sys.argv[1] == "all":
+    pygame.init()
+else:
+    pygame.display.init()
+    pygame.font.init()
+print(json.dumps({"init_ms": (time.perf_counter() - start) * 1000}))
+"""
+
+
+def run(code, cwd, *args):
+    env = dict(os.environ, PYTHONPATH=ROOT, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+               PYGAME_HIDE_SUPPORT_PROMPT="1")
+    output = subprocess.run([sys.executable, "-c", code, *args], cwd=cwd, env=env, capture_output=True, text=True,
+                            check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def median(results, key):
+    values = sorted(result[key] for result in results)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time and time to the first frame of the game.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--cache-entries", type=int, nargs="+", default=[0, 200_000],
+                        help="sizes of the old text cache to migrate on start-up")
+    args = parser.parse_args()
+
+    report = {}
+    for entries in args.cache_entries:
+        # Each run starts from a fresh data directory holding only the text cache, as on an upgrade.
+        results = []
+        for _ in range(args.runs):
+            cwd = tempfile.mkdtemp()
+            if entries:
+                os.makedirs(os.path.join(cwd, "data"))
+                rng = random.Random(25)
+                with open(os.path.join(cwd, "data", "cache.txt"), "w") as file:
+                    for _ in range(entries):
+                        file.write(f"{rng.getrandbits(64)}|{rng.uniform(-20, 20):.2f}|True\n")
+            results.append(run(CHILD, cwd))
+        report[f"text_cache_{entries}"] = {key: median(results, key) for key in results[0]}
+    for mode in ("all", "display_font"):
+        results = [run(PYGAME_INIT, ROOT, mode) for _ in range(args.runs)]
+        report[f"pygame_init_{mode}_ms"] = median(results, "init_ms")
+    print(json.dumps(report, indent=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import json
+import time
+
+from game.ai import CheckersAI
+from benchmarks.common import random_positions
+from utils.cache import cache
+
+
+def run(positions, depth, collect_stats):
+    ai = CheckersAI(time_budget_ms=None, collect_stats=collect_stats)
+    results = []
+    reports = []
+    start = time.perf_counter()
+    for board, color in positions:
+        cache.clear()
+        ai.reset_counters()
+        search_board = ai.search_board(board)
+        results.append((ai.search(search_board, depth)[:2], ai.nodes))
+        reports.append(ai.last_stats)
+    return results, reports, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost and output of the search stats collector.")
+    parser.add_argument("--positions", type=int, default=30)
+    parser.add_argument("--depth", type=int, default=5)
+    args = parser.parse_args()
+
+    positions = random_positions(args.positions, True, seed=18)
+    plain, _, plain_time = run(positions, args.depth, False)
+    instrumented, reports, instrumented_time = run(positions, args.depth, True)
+    if plain != instrumented:
+        raise AssertionError("collecting stats changed the search result")
+    for (result, nodes), report in zip(instrumented, reports):
+        if report["nodes"] != nodes:
+            raise AssertionError(f"stats counted {report['nodes']} nodes, the search {nodes}")
+    json.dumps(reports)
+    print(f"Same moves and node counts with and without stats over {len(positions)} depth-{args.depth} searches.")
+    print(f"Without stats: {plain_time:.2f}s, with stats: {instrumented_time:.2f}s "
+          f"({instrumented_time / plain_time - 1:+.0%}).")
+    print(json.dumps(reports[len(reports) // 2], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from game.ai import CheckersAI
+from benchmarks.common import random_positions
+from utils.cache import EvaluationStore, cache
+
+
+def run(positions, depth, store):
+    # The store's rows are unrelated positions, so every in-memory miss is a store miss as well.
+    cache.store = store
+    ai = CheckersAI(time_budget_ms=None)
+    results = []
+    misses = 0
+    start = time.perf_counter()
+    for board, color in positions:
+        cache.clear()
+        cache.reset_stats()
+        results.append(ai.search(ai.search_board(board), depth)[:2])
+        misses += cache.misses
+    elapsed = time.perf_counter() - start
+    cache.store = None
+    cache.clear()
+    return results, misses, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search time with the on-disk evaluation store attached.")
+    parser.add_argument("--positions", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "cache.db")
+    rng = random.Random(9)
+    EvaluationStore(path).add((rng.getrandbits(64), (round(rng.uniform(-20, 20), 1), True))
+                              for _ in range(args.rows))
+    positions = random_positions(args.positions, True, seed=9)
+
+    filtered = EvaluationStore(path)
+    start = time.perf_counter()
+    filtered.load_filter()
+    print(f"Loaded the key filter for {args.rows} rows in {time.perf_counter() - start:.2f}s.")
+
+    # The modes take turns and keep their fastest run, so drift on a busy machine hits them alike.
+    modes = (("no store", None), ("store", EvaluationStore(path)), ("store + filter", filtered))
+    best = {}
+    reference = None
+    for _ in range(args.repeats):
+        for name, store in modes:
+            results, misses, elapsed = run(positions, args.depth, store)
+            if reference is not None and results != reference:
+                raise AssertionError(f"the search with {name} chose differently")
+            reference = results
+            best[name] = min(best.get(name, elapsed), elapsed)
+    baseline = best["no store"]
+    for name, store in modes:
+        elapsed = best[name]
+        extra = (elapsed - baseline) / misses * 1e6 if misses else 0.0
+        print(f"{name:>14}: {elapsed:.2f}s for {len(positions)} depth-{args.depth} searches, {misses} misses, "
+              f"{extra:+.1f} us per miss against no store")
+
+
+if __name__ == "__main__":
+    main()
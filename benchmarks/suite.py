@@ -0,0 +1,221 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from core.bitboard import BitBoard
+from core.board import Board
+from core.moves import is_jump_move, legal_moves
+from game.ai import CheckersAI
+from game.perft import perft
+from utils.cache import cache
+import benchmarks.common  # noqa: F401  (detaches the on-disk evaluation store)
+
+CORPUS_FILE = os.path.join(os.path.dirname(__file__), "corpus.json")
+# Perft depths are chosen when the corpus is generated so each position stays under this many leaves.
+MAX_PERFT_LEAVES = 20_000
+
+
+def _entry(category, board):
+    return {"name": f"{category}-{board.hash:016x}", "category": category, "red": board.red, "blue": board.blue,
+            "kings": board.kings, "turn": board.turn}
+
+
+def _playouts(rng, count):
+    for _ in range(count):
+        board = BitBoard(True)
+        for ply in range(120):
+            legal = legal_moves(board)
+            if not legal:
+                break
+            yield ply, board
+            move = rng.choice(legal)
+            board.make_move(move[0], move[1], is_jump_move(move))
+
+
+def generate_corpus(seed=19, per_category=6):
+    rng = random.Random(seed)
+    corpus = {"opening": [], "midgame": [], "multi-jump": [], "king-endgame": []}
+    for ply, board in _playouts(rng, 400):
+        pieces = bin(board.red | board.blue).count("1")
+        jumps = board.get_all_moves(board.turn, True)[1]
+        longest = max((len(path) for paths in jumps.values() for path in paths), default=0)
+        if ply == 3 * len(corpus["opening"]) and len(corpus["opening"]) < per_category:
+            corpus["opening"].append(_entry("opening", board))
+        elif 20 <= ply <= 40 and pieces >= 14 and not board.kings and rng.random() < 0.02 and \
+                len(corpus["midgame"]) < per_category:
+            corpus["midgame"].append(_entry("midgame", board))
+        elif longest >= 3 and len(corpus["multi-jump"]) < per_category:
+            corpus["multi-jump"].append(_entry("multi-jump", board))
+    while len(corpus["king-endgame"]) < per_category:
+        red_count, blue_count = rng.choice(((2, 1), (2, 2), (3, 2), (3, 3), (4, 3)))
+        squares = rng.sample(range(32), red_count + blue_count)
+        red = sum(1 << square for square in squares[:red_count])
+        blue = sum(1 << square for square in squares[red_count:])
+        board = BitBoard(True, red, blue, red | blue, rng.choice(("RED", "BLUE")))
+        if legal_moves(board):
+            corpus["king-endgame"].append(_entry("king-endgame", board))
+    entries = [entry for category in corpus.values() for entry in category]
+    for entry in entries:
+        entry["perft"] = {}
+        for must_jump in (True, False):
+            board = _bitboard(entry, must_jump)
+            depth, leaves = 0, 1
+            while True:
+                next_leaves = perft(board, depth + 1)
+                if next_leaves > MAX_PERFT_LEAVES or depth == 10:
+                    break
+                depth, leaves = depth + 1, next_leaves
+            entry["perft"][_mode(must_jump)] = [depth, leaves]
+    return entries
+
+
+def _mode(must_jump):
+    return "must_jump" if must_jump else "free"
+
+
+def _bitboard(entry, must_jump):
+    return BitBoard(must_jump, entry["red"], entry["blue"], entry["kings"], entry["turn"])
+
+
+def _boards(entry, must_jump):
+    bitboard = _bitboard(entry, must_jump)
+    return {"board": Board.from_bitboard(bitboard), "bitboard": bitboard}
+
+
+def _timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return result, time.perf_counter() - start
+
+
+def _evaluate(board, must_jump):
+    cache.clear()
+    return board.evaluate(must_jump)
+
+
+def measure(entry, must_jump, search_depth, evaluations):
+    result = {"name": entry["name"], "category": entry["category"], "mode": _mode(must_jump)}
+    depth, expected = entry["perft"][_mode(must_jump)]
+    for name, board in _boards(entry, must_jump).items():
+        leaves, elapsed = _timed(lambda: perft(board, depth), 1)
+        if leaves != expected:
+            raise AssertionError(f"{entry['name']} ({_mode(must_jump)}): {name} perft({depth}) = {leaves}, "
+                                 f"expected {expected}")
+        _, evaluate_time = _timed(lambda: _evaluate(board, must_jump), evaluations)
+        cache.clear()
+        ai = CheckersAI(use_bitboard=name == "bitboard", time_budget_ms=None)
+        search_board = board.copy()
+        _, search_time = _timed(lambda: ai.search(search_board, search_depth), 1)
+        ai.close()
+        result[name] = {
+            "perft_depth": depth,
+            "perft_leaves": leaves,
+            "perft_seconds": elapsed,
+            "perft_leaves_per_second": leaves / elapsed if elapsed else None,
+            "evaluations": evaluations,
+            "evaluate_seconds": evaluate_time,
+            "evaluations_per_second": evaluations / evaluate_time,
+            "search_depth": search_depth,
+            "search_nodes": ai.nodes,
+            "search_seconds": search_time,
+            "search_nodes_per_second": ai.nodes / search_time if search_time else None,
+        }
+    return result
+
+
+def summarize(results):
+    totals = {}
+    for result in results:
+        for name in ("board", "bitboard"):
+            measured = result[name]
+            total = totals.setdefault(name, dict.fromkeys(
+                ("perft_leaves", "perft_seconds", "evaluations", "evaluate_seconds", "search_nodes",
+                 "search_seconds"), 0))
+            for key in total:
+                total[key] += measured[key]
+    for total in totals.values():
+        total["perft_leaves_per_second"] = total["perft_leaves"] / total["perft_seconds"]
+        total["evaluations_per_second"] = total["evaluations"] / total["evaluate_seconds"]
+        total["search_nodes_per_second"] = total["search_nodes"] / total["search_seconds"]
+    return totals
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous, current):
+    # Ratios above 1 mean the current run is faster.
+    keys = ("perft_seconds", "evaluate_seconds", "search_seconds")
+    old = {(result["name"], result["mode"]): result for result in previous["results"]}
+    print(f"{'position':<30} {'mode':<9} {'board':<8}   perft evaluate  search", file=sys.stderr)
+    for result in current["results"]:
+        before = old.get((result["name"], result["mode"]))
+        if before is None:
+            continue
+        for name in ("board", "bitboard"):
+            print(f"{result['name']:<30} {result['mode']:<9} {name:<8} "
+                  + " ".join(f"{before[name][key] / result[name][key]:7.2f}x" for key in keys), file=sys.stderr)
+    for name, total in current["totals"].items():
+        before = previous["totals"].get(name)
+        if before:
+            print(f"{name}: perft {total['perft_leaves_per_second'] / before['perft_leaves_per_second']:.2f}x, "
+                  f"evaluate {total['evaluations_per_second'] / before['evaluations_per_second']:.2f}x, "
+                  f"search {total['search_nodes_per_second'] / before['search_nodes_per_second']:.2f}x",
+                  file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move generation, evaluation and search on a fixed corpus.")
+    parser.add_argument("--search-depth", type=int, default=5)
+    parser.add_argument("--evaluations", type=int, default=200, help="evaluate calls per position")
+    parser.add_argument("--category", action="append", help="only run these categories")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="a previous JSON report to compare against")
+    parser.add_argument("--regenerate", action="store_true", help="rebuild the corpus and its perft counts")
+    args = parser.parse_args()
+
+    if args.regenerate:
+        with open(CORPUS_FILE, "w") as file:
+            json.dump(generate_corpus(), file, indent=1)
+            file.write("\n")
+    with open(CORPUS_FILE) as file:
+        corpus = json.load(file)
+
+    results = []
+    for entry in corpus:
+        if args.category and entry["category"] not in args.category:
+            continue
+        for must_jump in (True, False):
+            results.append(measure(entry, must_jump, args.search_depth, args.evaluations))
+    report = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "search_depth": args.search_depth,
+        "results": results,
+        "totals": summarize(results),
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+    if args.compare:
+        with open(args.compare) as file:
+            compare(json.load(file), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import numpy as np
+
+from core.bitboard import POSITION_SCORE
+from core.board import Board
+from core.masks import JUMP_LANDING, NEIGHBOR, SQUARE_POS
+from core.piece import Piece
+
+CHUNK_SIZE = 65536
+
+DARK_ROWS = np.array([row for row, col in SQUARE_POS])
+DARK_COLS = np.array([col for row, col in SQUARE_POS])
+
+# Index 32 is a padding square, never empty and never occupied, for steps off the board.
+OFF_BOARD = 32
+NEIGHBOR_INDEX = np.array([[OFF_BOARD if sq < 0 else sq for sq in row] for row in NEIGHBOR])
+LANDING_INDEX = np.array([[OFF_BOARD if sq < 0 else sq for sq in row] for row in JUMP_LANDING])
+
+# Rows are piece codes; the direction columns follow core.bitboard.DIRECTIONS.
+MOVE_DIRECTIONS = np.zeros((5, 4), dtype=bool)
+MOVE_DIRECTIONS[Piece.RED, [0, 1]] = True
+MOVE_DIRECTIONS[Piece.BLUE, [2, 3]] = True
+MOVE_DIRECTIONS[Piece.RED_KING] = True
+MOVE_DIRECTIONS[Piece.BLUE_KING] = True
+
+# Material plus positional score for each piece code on each square, padding included.
+SQUARE_SCORE = np.zeros((5, OFF_BOARD + 1))
+for piece, scores in POSITION_SCORE.items():
+    SQUARE_SCORE[piece, :OFF_BOARD] = scores
+    SQUARE_SCORE[piece, :OFF_BOARD] += Board.KING_VALUE if Piece.is_king(piece) else 1
+
+
+def to_squares(positions):
+    positions = np.asarray(positions, dtype=np.int8)
+    if positions.ndim == 2 and positions.shape[1] == 32:
+        return positions
+    if positions.ndim == 3 and positions.shape[1:] == (8, 8):
+        return positions[:, DARK_ROWS, DARK_COLS]
+    raise ValueError(f"expected an N x 8 x 8 or N x 32 array, got shape {positions.shape}")
+
+
+def boards_to_array(boards):
+    return np.array([[board.board[row][col] for row, col in SQUARE_POS] for board in boards], dtype=np.int8)
+
+
+def _count_jumps(squares, own, opponent, empty):
+    # Walks every capture path at once; captured pieces stay on the board, as in Board.
+    count = np.zeros(len(squares), dtype=np.int64)
+    boards, starts = np.nonzero(own)
+    kinds = squares[boards, starts]
+    visited = np.left_shift(1, starts, dtype=np.int64)
+    current = starts
+    jumped = np.zeros(len(boards), dtype=bool)
+    while len(boards):
+        extended = np.zeros(len(boards), dtype=bool)
+        next_states = []
+        for direction in range(4):
+            landing = LANDING_INDEX[direction][current]
+            ok = MOVE_DIRECTIONS[kinds, direction] & empty[boards, landing] \
+                & opponent[boards, NEIGHBOR_INDEX[direction][current]] \
+                & (np.right_shift(visited, landing % OFF_BOARD) & 1 == 0)
+            extended |= ok
+            next_states.append((boards[ok], kinds[ok], visited[ok] | np.left_shift(1, landing[ok], dtype=np.int64),
+                                landing[ok]))
+        np.add.at(count, boards[jumped & ~extended], 1)
+        boards, kinds, visited, current = (np.concatenate(parts) for parts in zip(*next_states))
+        jumped = np.ones(len(boards), dtype=bool)
+    return count
+
+
+def _mobility(squares, red, blue, empty, must_jump):
+    mobility = []
+    for own, opponent in ((red, blue), (blue, red)):
+        moves = np.zeros(len(squares), dtype=np.int64)
+        for direction in range(4):
+            movable = own[:, :OFF_BOARD] & MOVE_DIRECTIONS[squares[:, :OFF_BOARD], direction] \
+                & empty[:, NEIGHBOR_INDEX[direction]]
+            moves += movable.sum(axis=1)
+        jumps = _count_jumps(squares, own, opponent, empty)
+        mobility.append(np.where(must_jump & (jumps > 0), jumps, moves + jumps))
+    return mobility
+
+
+def _evaluate_chunk(squares, must_jump):
+    red = (squares == Piece.RED) | (squares == Piece.RED_KING)
+    blue = (squares == Piece.BLUE) | (squares == Piece.BLUE_KING)
+    padding = np.zeros((len(squares), 1), dtype=bool)
+    empty = np.hstack([squares == Piece.EMPTY, padding])
+    red = np.hstack([red, padding])
+    blue = np.hstack([blue, padding])
+    squares = np.hstack([squares, np.zeros((len(squares), 1), dtype=np.int8)])
+
+    scores = SQUARE_SCORE[squares, np.arange(OFF_BOARD + 1)]
+    red_mobility, blue_mobility = _mobility(squares, red, blue, empty, must_jump)
+    red_score = (scores * red).sum(axis=1) + red_mobility * Board.MOBILITY_WEIGHT
+    blue_score = (scores * blue).sum(axis=1) + blue_mobility * Board.MOBILITY_WEIGHT
+    return red_score - blue_score
+
+
+def evaluate_batch(positions, must_jump):
+    squares = to_squares(positions)
+    must_jump = np.broadcast_to(np.asarray(must_jump, dtype=bool), (len(squares),))
+    evaluations = np.empty(len(squares))
+    for start in range(0, len(squares), CHUNK_SIZE):
+        end = start + CHUNK_SIZE
+        evaluations[start:end] = _evaluate_chunk(squares[start:end], must_jump[start:end])
+    return evaluations
@@ -0,0 +1,208 @@
+from core.board import POSITION_SCORE as BOARD_POSITION_SCORE, Board
+from core.masks import (BOTTOM_ROW, KING_DIRECTIONS, NEIGHBOR, SQUARE_INDEX, SQUARE_POS, TOP_ROW, _find_jumps, _movers,
+                        _sides, count_moves, popcount)
+from core.piece import Piece
+from core.zobrist import MUST_JUMP_KEY, PIECE_KEYS, RED_TO_MOVE_KEY
+from utils.cache import cache
+
+SQUARE_KEYS = {piece: tuple(keys[row * 8 + col] for row, col in SQUARE_POS) for piece, keys in PIECE_KEYS.items()}
+POSITION_SCORE = {piece: tuple(scores[row * 8 + col] for row, col in SQUARE_POS)
+                  for piece, scores in BOARD_POSITION_SCORE.items()}
+
+
+class BitBoard:
+
+    def __init__(self, must_jump, red=0x00000FFF, blue=0xFFF00000, kings=0, turn="BLUE"):
+        self.must_jump = must_jump
+        self.red = red
+        self.blue = blue
+        self.kings = kings
+        self.turn = turn
+        self._rebuild_totals()
+
+    def _rebuild_totals(self):
+        self.hash = RED_TO_MOVE_KEY if self.turn == "RED" else 0
+        if self.must_jump:
+            self.hash ^= MUST_JUMP_KEY
+        self.red_position = self.blue_position = 0.0
+        for square in range(32):
+            piece = self.piece_at(square)
+            if piece != Piece.EMPTY:
+                self.hash ^= SQUARE_KEYS[piece][square]
+                if Piece.is_red(piece):
+                    self.red_position += POSITION_SCORE[piece][square]
+                else:
+                    self.blue_position += POSITION_SCORE[piece][square]
+
+    @classmethod
+    def from_board(cls, board):
+        red = blue = kings = 0
+        for square, (row, col) in enumerate(SQUARE_POS):
+            piece = board.board[row][col]
+            bit = 1 << square
+            if Piece.is_red(piece):
+                red |= bit
+            elif Piece.is_blue(piece):
+                blue |= bit
+            if Piece.is_king(piece):
+                kings |= bit
+        return cls(board.must_jump, red, blue, kings, board.turn)
+
+    def copy(self):
+        new_board = BitBoard.__new__(BitBoard)
+        new_board.__dict__.update(self.__dict__)
+        return new_board
+
+    @property
+    def red_pieces(self):
+        return popcount(self.red & ~self.kings)
+
+    @property
+    def red_kings(self):
+        return popcount(self.red & self.kings)
+
+    @property
+    def blue_pieces(self):
+        return popcount(self.blue & ~self.kings)
+
+    @property
+    def blue_kings(self):
+        return popcount(self.blue & self.kings)
+
+    def bitmasks(self):
+        return self.red, self.blue, self.kings
+
+    def piece_at(self, square):
+        bit = 1 << square
+        if self.red & bit:
+            return Piece.RED_KING if self.kings & bit else Piece.RED
+        if self.blue & bit:
+            return Piece.BLUE_KING if self.kings & bit else Piece.BLUE
+        return Piece.EMPTY
+
+    def to_grid(self):
+        grid = [[Piece.EMPTY for _ in range(8)] for _ in range(8)]
+        for square, (row, col) in enumerate(SQUARE_POS):
+            grid[row][col] = self.piece_at(square)
+        return grid
+
+    def get_all_moves(self, color, must_jump):
+        own, opponent, man_directions, king_jump_directions = _sides(self.red, self.blue, color)
+        empty, movers, jumpers = _movers(own, opponent, self.kings, man_directions)
+        moves = {}
+        jumps = {}
+        any_jumper = jumpers[0] | jumpers[1] | jumpers[2] | jumpers[3]
+        active = movers[0] | movers[1] | movers[2] | movers[3] | any_jumper
+        while active:
+            low = active & -active
+            active ^= low
+            square = low.bit_length() - 1
+            pos = SQUARE_POS[square]
+            is_king = self.kings & low
+            directions = KING_DIRECTIONS if is_king else man_directions
+            piece_moves = [SQUARE_POS[NEIGHBOR[d][square]] for d in directions if movers[d] & low]
+            if piece_moves:
+                moves[pos] = piece_moves
+            if any_jumper & low:
+                piece_jumps = []
+                _find_jumps(square, king_jump_directions if is_king else man_directions,
+                            opponent, empty, [pos], low, piece_jumps)
+                jumps[pos] = piece_jumps
+        if must_jump and jumps:
+            moves = {}
+        return moves, jumps
+
+    def count_moves(self, color, must_jump):
+        return count_moves(self.red, self.blue, self.kings, color, must_jump)
+
+    def evaluate(self, must_jump):
+        cached = cache.get(self.hash)
+        if cached is not None:
+            return cached[0]
+
+        red_score = self.red_pieces + (self.red_kings * Board.KING_VALUE) + self.red_position
+        blue_score = self.blue_pieces + (self.blue_kings * Board.KING_VALUE) + self.blue_position
+
+        red_score += self.count_moves("RED", must_jump) * Board.MOBILITY_WEIGHT
+        blue_score += self.count_moves("BLUE", must_jump) * Board.MOBILITY_WEIGHT
+
+        evaluation = red_score - blue_score
+        cache.put(self.hash, (evaluation, self.must_jump))
+
+        return evaluation
+
+    def promotes(self, start_pos, end_pos):
+        start_bit = 1 << SQUARE_INDEX[start_pos]
+        if self.kings & start_bit:
+            return False
+        promotion_row = BOTTOM_ROW if self.red & start_bit else TOP_ROW
+        return bool(promotion_row >> SQUARE_INDEX[end_pos] & 1)
+
+    def make_move(self, start_pos, move_data, is_jump):
+        undo = (self.red, self.blue, self.kings, self.hash, self.red_position, self.blue_position)
+        if is_jump:
+            self.play_jump(move_data)
+        else:
+            self.play_move(start_pos, move_data)
+        return undo
+
+    def unmake_move(self, undo):
+        self.red, self.blue, self.kings, self.hash, self.red_position, self.blue_position = undo
+        self.turn = "BLUE" if self.turn == "RED" else "RED"
+
+    def _end_turn(self):
+        self.turn = "BLUE" if self.turn == "RED" else "RED"
+        self.hash ^= RED_TO_MOVE_KEY
+
+    def _move_piece(self, start, end):
+        start_bit = 1 << start
+        end_bit = 1 << end
+        piece = self.piece_at(start)
+        is_red = self.red & start_bit
+        if is_red:
+            self.red ^= start_bit | end_bit
+            promotion_row = BOTTOM_ROW
+        else:
+            self.blue ^= start_bit | end_bit
+            promotion_row = TOP_ROW
+        if self.kings & start_bit:
+            self.kings ^= start_bit | end_bit
+        elif end_bit & promotion_row:
+            self.kings |= end_bit
+        moved = self.piece_at(end)
+        self.hash ^= SQUARE_KEYS[piece][start] ^ SQUARE_KEYS[moved][end]
+        change = POSITION_SCORE[moved][end] - POSITION_SCORE[piece][start]
+        if is_red:
+            self.red_position += change
+        else:
+            self.blue_position += change
+
+    def play_move(self, start_pos, end_pos, print_move=False):
+        if print_move:
+            print(f"Piece at ({start_pos[0]}, {start_pos[1]}) moves to ({end_pos[0]}, {end_pos[1]}).")
+        self._move_piece(SQUARE_INDEX[start_pos], SQUARE_INDEX[end_pos])
+        self._end_turn()
+
+    def play_jump(self, jump_sequence, print_move=False):
+        if len(jump_sequence) < 2:
+            return
+
+        for i in range(len(jump_sequence) - 1):
+            start_row, start_col = jump_sequence[i]
+            end_row, end_col = jump_sequence[i + 1]
+            if print_move:
+                print(f"Piece at ({start_row}, {start_col}) jumps to ({end_row}, {end_col}).")
+            middle = SQUARE_INDEX[((start_row + end_row) // 2, (start_col + end_col) // 2)]
+            captured = self.piece_at(middle)
+            if captured != Piece.EMPTY:
+                self.hash ^= SQUARE_KEYS[captured][middle]
+                if Piece.is_red(captured):
+                    self.red_position -= POSITION_SCORE[captured][middle]
+                else:
+                    self.blue_position -= POSITION_SCORE[captured][middle]
+                keep = ~(1 << middle)
+                self.red &= keep
+                self.blue &= keep
+                self.kings &= keep
+            self._move_piece(SQUARE_INDEX[jump_sequence[i]], SQUARE_INDEX[jump_sequence[i + 1]])
+        self._end_turn()
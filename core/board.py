@@ -1,7 +1,40 @@
-from core.piece import is_valid_position, Piece, board_to_cache_key
+from core.masks import count_moves
+from core.piece import is_valid_position, Piece
+from core.zobrist import PIECE_KEYS, RED_TO_MOVE_KEY, hash_board
 from utils.cache import cache
 
 
+RED_PIECES = frozenset([Piece.RED, Piece.RED_KING])
+BLUE_PIECES = frozenset([Piece.BLUE, Piece.BLUE_KING])
+
+MOVE_DIRECTIONS = {
+    Piece.EMPTY: (),
+    Piece.RED: ((1, -1), (1, 1)),
+    Piece.BLUE: ((-1, -1), (-1, 1)),
+    Piece.RED_KING: ((1, -1), (1, 1), (-1, -1), (-1, 1)),
+    Piece.BLUE_KING: ((1, -1), (1, 1), (-1, -1), (-1, 1)),
+}
+# Jumps try a king's forward directions first.
+JUMP_DIRECTIONS = dict(MOVE_DIRECTIONS)
+JUMP_DIRECTIONS[Piece.BLUE_KING] = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+def _move_targets(directions):
+    return tuple(tuple((row + dr, col + dc) for dr, dc in directions if is_valid_position(row + dr, col + dc))
+                 for row in range(8) for col in range(8))
+
+
+def _jump_targets(directions):
+    return tuple(tuple((row + dr, col + dc, row + 2 * dr, col + 2 * dc, (row + 2 * dr) * 8 + col + 2 * dc)
+                       for dr, dc in directions if is_valid_position(row + 2 * dr, col + 2 * dc))
+                 for row in range(8) for col in range(8))
+
+
+# Per-square destinations by piece type, in the direction order move generation has always used.
+MOVE_TARGETS = {piece: _move_targets(directions) for piece, directions in MOVE_DIRECTIONS.items()}
+JUMP_TARGETS = {piece: _jump_targets(directions) for piece, directions in JUMP_DIRECTIONS.items()}
+
+
 class Board:
     # Evaluation weight constants
     KING_VALUE = 3
@@ -23,7 +56,6 @@ class Board:
         self.blue_kings = 0
         self.must_jump = must_jump
         self.board = [[Piece.EMPTY for _ in range(8)] for _ in range(8)]
-        self.cache = {}
         for row in range(8):
             for col in range(8):
                 if (row + col) % 2 == 1:
@@ -31,86 +63,112 @@ class Board:
                         self.board[row][col] = Piece.RED
                     elif row > 4:
                         self.board[row][col] = Piece.BLUE
+        self.turn = "BLUE"
+        self._rebuild_totals()
+
+    def _rebuild_totals(self):
+        key = hash_board(self.board, self.turn, self.must_jump)
+        self.hash = 0
+        self.red_position = self.blue_position = 0.0
+        self.red_bits = self.blue_bits = self.king_bits = 0
+        for row in range(8):
+            for col in range(8):
+                piece = self.board[row][col]
+                if piece != Piece.EMPTY:
+                    self._put_piece(row, col, piece)
+        self.hash = key
+
+    def _put_piece(self, row, col, piece):
+        # Keeps the hash, positional totals and square masks in step with the grid.
+        self.board[row][col] = piece
+        square = row * 8 + col
+        bit = 1 << (row * 4 + col // 2)
+        self.hash ^= PIECE_KEYS[piece][square]
+        if Piece.is_red(piece):
+            self.red_position += POSITION_SCORE[piece][square]
+            self.red_bits |= bit
+        else:
+            self.blue_position += POSITION_SCORE[piece][square]
+            self.blue_bits |= bit
+        if Piece.is_king(piece):
+            self.king_bits |= bit
+
+    def _remove_piece(self, row, col):
+        piece = self.board[row][col]
+        self.board[row][col] = Piece.EMPTY
+        square = row * 8 + col
+        bit = ~(1 << (row * 4 + col // 2))
+        self.hash ^= PIECE_KEYS[piece][square]
+        if Piece.is_red(piece):
+            self.red_position -= POSITION_SCORE[piece][square]
+            self.red_bits &= bit
+        else:
+            self.blue_position -= POSITION_SCORE[piece][square]
+            self.blue_bits &= bit
+        self.king_bits &= bit
+        return piece
+
+    @classmethod
+    def from_bitboard(cls, bitboard):
+        board = cls(bitboard.must_jump)
+        board.board = bitboard.to_grid()
+        board.red_pieces, board.red_kings = bitboard.red_pieces, bitboard.red_kings
+        board.blue_pieces, board.blue_kings = bitboard.blue_pieces, bitboard.blue_kings
+        board.turn = bitboard.turn
+        board._rebuild_totals()
+        return board
 
     def copy(self):
-        new_board = Board(self.must_jump)
+        new_board = Board.__new__(Board)
+        new_board.must_jump = self.must_jump
         new_board.board = [row[:] for row in self.board]
         new_board.red_pieces = self.red_pieces
         new_board.red_kings = self.red_kings
         new_board.blue_pieces = self.blue_pieces
         new_board.blue_kings = self.blue_kings
+        new_board.turn = self.turn
+        new_board.hash = self.hash
+        new_board.red_position = self.red_position
+        new_board.blue_position = self.blue_position
+        new_board.red_bits = self.red_bits
+        new_board.blue_bits = self.blue_bits
+        new_board.king_bits = self.king_bits
         return new_board
 
-    def get_moves_for_piece(self, piece, row, col):
-        moves = []
-        directions = []
-        if piece == Piece.RED:
-            directions.extend([(1, -1), (1, 1)])
-        elif piece == Piece.BLUE:
-            directions.extend([(-1, -1), (-1, 1)])
-        elif Piece.is_king(piece):
-            directions.extend([(1, -1), (1, 1), (-1, -1), (-1, 1)])
-        for dr, dc in directions:
-            new_row, new_col = row + dr, col + dc
-            if is_valid_position(new_row, new_col) and self.board[new_row][new_col] == Piece.EMPTY:
-                moves.append((new_row, new_col))
+    def bitmasks(self):
+        return self.red_bits, self.blue_bits, self.king_bits
 
-        return moves
+    def _end_turn(self):
+        self.turn = "BLUE" if self.turn == "RED" else "RED"
+        self.hash ^= RED_TO_MOVE_KEY
+
+    def get_moves_for_piece(self, piece, row, col):
+        board = self.board
+        return [(new_row, new_col) for new_row, new_col in MOVE_TARGETS[piece][row * 8 + col]
+                if board[new_row][new_col] == Piece.EMPTY]
 
     def get_jumps_for_piece(self, piece, row, col):
-        directions = []
-        if Piece.is_red(piece):
-            directions.extend([(1, -1), (1, 1)])
-        if Piece.is_blue(piece):
-            directions.extend([(-1, -1), (-1, 1)])
-        if Piece.is_king(piece):
-            if Piece.is_red(piece):
-                directions.extend([(-1, -1), (-1, 1)])
-            else:
-                directions.extend([(1, -1), (1, 1)])
-
-        def find_jumps(row, col, current_path, current_piece):
-            found_jumps = []
-            for dr, dc in directions:
-                middle_row, middle_col = row + dr, col + dc
-                jump_row, jump_col = row + 2 * dr, col + 2 * dc
-                if is_valid_position(middle_row, middle_col) and is_valid_position(jump_row, jump_col):
-                    middle_piece = self.board[middle_row][middle_col]
-                    new_pos = (jump_row, jump_col)
-                    if Piece.is_blue(current_piece):
-                        if Piece.is_red(middle_piece) and self.board[jump_row][jump_col] == Piece.EMPTY:
-                            if new_pos not in current_path:
-                                next_path = current_path + [new_pos]
-
-                                if jump_row == 0 and not Piece.is_king(current_piece):
-                                    new_piece = Piece.BLUE_KING
-                                else:
-                                    new_piece = current_piece
-
-                                sub_jumps = find_jumps(jump_row, jump_col, next_path, new_piece)
-                                if sub_jumps:
-                                    found_jumps.extend(sub_jumps)
-                                else:
-                                    found_jumps.append(next_path)
-
-                    elif Piece.is_red(current_piece):
-                        if Piece.is_blue(middle_piece) and self.board[jump_row][jump_col] == Piece.EMPTY:
-                            if new_pos not in current_path:
-                                next_path = current_path + [new_pos]
-                                if jump_row == 7 and not Piece.is_king(current_piece):
-                                    new_piece = Piece.RED_KING
-                                else:
-                                    new_piece = current_piece
-
-                                sub_jumps = find_jumps(jump_row, jump_col, next_path, new_piece)
-                                if sub_jumps:
-                                    found_jumps.extend(sub_jumps)
-                                else:
-                                    found_jumps.append(next_path)
-            return found_jumps
-
-        all_jumps = find_jumps(row, col, [(row, col)], piece)
-        return all_jumps
+        targets = JUMP_TARGETS[piece]
+        opponents = BLUE_PIECES if Piece.is_red(piece) else RED_PIECES
+        board = self.board
+        path = [(row, col)]
+        found_jumps = []
+
+        # Directions stay those of the moving piece even if it promotes part-way through.
+        def find_jumps(square, visited):
+            extended = False
+            for middle_row, middle_col, jump_row, jump_col, jump_square in targets[square]:
+                if board[middle_row][middle_col] in opponents and board[jump_row][jump_col] == Piece.EMPTY \
+                        and not visited >> jump_square & 1:
+                    path.append((jump_row, jump_col))
+                    find_jumps(jump_square, visited | 1 << jump_square)
+                    path.pop()
+                    extended = True
+            if not extended and len(path) > 1:
+                found_jumps.append(path[:])
+
+        find_jumps(row * 8 + col, 1 << (row * 8 + col))
+        return found_jumps
 
     def get_all_moves_for_piece(self, piece, row, col):
         return self.get_moves_for_piece(piece, row, col), self.get_jumps_for_piece(piece, row, col)
@@ -133,65 +191,53 @@ class Board:
             moves = {}
         return moves, jumps
     
-    def _evaluate_piece_position(self, piece, row, col):
+    @classmethod
+    def _evaluate_piece_position(cls, piece, row, col):
         score = 0.0
         is_on_edge = col == 0 or col == 7
         is_on_board_edge = is_on_edge or row == 0 or row == 7
-        is_central = (row, col) in self.CENTRAL_POSITIONS
+        is_central = (row, col) in cls.CENTRAL_POSITIONS
         
         if piece == Piece.RED:
-            score += row * self.ADVANCEMENT_WEIGHT
+            score += row * cls.ADVANCEMENT_WEIGHT
             if is_central:
-                score += self.CENTRAL_CONTROL_BONUS
+                score += cls.CENTRAL_CONTROL_BONUS
             elif is_on_edge:
-                score += self.EDGE_BONUS
+                score += cls.EDGE_BONUS
                 
         elif piece == Piece.RED_KING:
-            score += self.KING_VALUE
+            score += cls.KING_VALUE
             if is_central:
-                score += self.CENTRAL_CONTROL_BONUS
+                score += cls.CENTRAL_CONTROL_BONUS
             elif is_on_board_edge:
-                score += self.EDGE_BONUS
+                score += cls.EDGE_BONUS
                 
         elif piece == Piece.BLUE:
-            score += (7 - row) * self.ADVANCEMENT_WEIGHT
+            score += (7 - row) * cls.ADVANCEMENT_WEIGHT
             if is_central:
-                score += self.CENTRAL_CONTROL_BONUS
+                score += cls.CENTRAL_CONTROL_BONUS
             elif is_on_edge:
-                score += self.EDGE_BONUS
+                score += cls.EDGE_BONUS
                 
         elif piece == Piece.BLUE_KING:
-            score += self.KING_VALUE
+            score += cls.KING_VALUE
             if is_central:
-                score += self.CENTRAL_CONTROL_BONUS
+                score += cls.CENTRAL_CONTROL_BONUS
             elif is_on_board_edge:
-                score += self.EDGE_BONUS
+                score += cls.EDGE_BONUS
         
         return score
     
     def _calculate_mobility(self, color, must_jump):
-        moves, jumps = self.get_all_moves(color, must_jump)
-        total_moves = sum(len(move_list) for move_list in moves.values())
-        total_jumps = sum(len(jump_list) for jump_list in jumps.values())
-        return total_moves + total_jumps
+        return count_moves(self.red_bits, self.blue_bits, self.king_bits, color, must_jump)
 
     def evaluate(self, must_jump):
-        cache_key = board_to_cache_key(self.board)
-        if cache_key in cache:
-            return cache[cache_key][0]
-        
-        red_score = self.red_pieces + (self.red_kings * self.KING_VALUE)
-        blue_score = self.blue_pieces + (self.blue_kings * self.KING_VALUE)
+        cached = cache.get(self.hash)
+        if cached is not None:
+            return cached[0]
         
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece != Piece.EMPTY:
-                    piece_score = self._evaluate_piece_position(piece, row, col)
-                    if Piece.is_red(piece):
-                        red_score += piece_score
-                    else:
-                        blue_score += piece_score
+        red_score = self.red_pieces + (self.red_kings * self.KING_VALUE) + self.red_position
+        blue_score = self.blue_pieces + (self.blue_kings * self.KING_VALUE) + self.blue_position
         
         red_mobility = self._calculate_mobility("RED", must_jump)
         blue_mobility = self._calculate_mobility("BLUE", must_jump)
@@ -206,8 +252,7 @@ class Board:
     def play_move(self, start_pos, end_pos, print_move=False):
         start_row, start_col = start_pos
         end_row, end_col = end_pos
-        piece = self.board[start_row][start_col]
-        self.board[start_row][start_col] = Piece.EMPTY
+        piece = self._remove_piece(start_row, start_col)
         if print_move:
             print(f"Piece at ({start_row}, {start_col}) moves to ({end_row}, {end_col}).")
         if piece == Piece.RED and end_row == 7:
@@ -218,7 +263,8 @@ class Board:
             piece = Piece.BLUE_KING
             self.blue_pieces -= 1
             self.blue_kings += 1
-        self.board[end_row][end_col] = piece
+        self._put_piece(end_row, end_col, piece)
+        self._end_turn()
 
     def play_jump(self, jump_sequence, print_move=False):
         if len(jump_sequence) < 2:
@@ -242,9 +288,10 @@ class Board:
                 self.red_kings -= 1
             elif mid_piece == Piece.BLUE_KING:
                 self.blue_kings -= 1
-            self.board[mid_row][mid_col] = Piece.EMPTY
+            if mid_piece != Piece.EMPTY:
+                self._remove_piece(mid_row, mid_col)
             
-            self.board[start_row][start_col] = Piece.EMPTY
+            self._remove_piece(start_row, start_col)
             
             if piece == Piece.RED and end_row == 7:
                 piece = Piece.RED_KING
@@ -255,9 +302,47 @@ class Board:
                 self.blue_pieces -= 1
                 self.blue_kings += 1
             
-            self.board[end_row][end_col] = piece
+            self._put_piece(end_row, end_col, piece)
+        self._end_turn()
+
+    def promotes(self, start_pos, end_pos):
+        piece = self.board[start_pos[0]][start_pos[1]]
+        return (piece == Piece.RED and end_pos[0] == 7) or (piece == Piece.BLUE and end_pos[0] == 0)
+
+    def make_move(self, start_pos, move_data, is_jump):
+        path = move_data if is_jump else (start_pos, move_data)
+        start_row, start_col = path[0]
+        captured = []
+        if is_jump:
+            for (from_row, from_col), (to_row, to_col) in zip(path, path[1:]):
+                mid_row, mid_col = (from_row + to_row) // 2, (from_col + to_col) // 2
+                captured.append((mid_row, mid_col, self.board[mid_row][mid_col]))
+        undo = (path, self.board[start_row][start_col], captured,
+                (self.red_pieces, self.blue_pieces, self.red_kings, self.blue_kings),
+                (self.hash, self.red_position, self.blue_position, self.red_bits, self.blue_bits, self.king_bits))
+        if is_jump:
+            self.play_jump(move_data)
+        else:
+            self.play_move(start_pos, move_data)
+        return undo
+
+    def unmake_move(self, undo):
+        path, piece, captured, counters, totals = undo
+        end_row, end_col = path[-1]
+        self.board[end_row][end_col] = Piece.EMPTY
+        for row, col, captured_piece in captured:
+            self.board[row][col] = captured_piece
+        start_row, start_col = path[0]
+        self.board[start_row][start_col] = piece
+        self.red_pieces, self.blue_pieces, self.red_kings, self.blue_kings = counters
+        self.turn = "BLUE" if self.turn == "RED" else "RED"
+        self.hash, self.red_position, self.blue_position, self.red_bits, self.blue_bits, self.king_bits = totals
 
     def add_cache(self, evaluation):
-        if board_to_cache_key(self.board) in cache:
-            return
-        cache[board_to_cache_key(self.board)] = (evaluation, self.must_jump)
+        cache.put(self.hash, (evaluation, self.must_jump))
+
+
+POSITION_SCORE = {
+    piece: tuple(Board._evaluate_piece_position(piece, row, col) for row in range(8) for col in range(8))
+    for piece in (Piece.RED, Piece.BLUE, Piece.RED_KING, Piece.BLUE_KING)
+}
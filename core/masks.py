@@ -0,0 +1,97 @@
+# Bit i is the i-th dark square in row-major order, four per row.
+FULL = 0xFFFFFFFF
+SQUARE_POS = tuple((i // 4, 2 * (i % 4) + 1 - (i // 4) % 2) for i in range(32))
+SQUARE_INDEX = {pos: i for i, pos in enumerate(SQUARE_POS)}
+
+EVEN_ROWS = sum(1 << i for i in range(32) if (i // 4) % 2 == 0)
+ODD_ROWS = FULL ^ EVEN_ROWS
+LEFT_EDGE = sum(1 << i for i, (row, col) in enumerate(SQUARE_POS) if col == 0)
+RIGHT_EDGE = sum(1 << i for i, (row, col) in enumerate(SQUARE_POS) if col == 7)
+TOP_ROW = 0x0000000F
+BOTTOM_ROW = 0xF0000000
+
+# Direction order matches Board: down-left, down-right, up-left, up-right.
+DIRECTIONS = ((1, -1), (1, 1), (-1, -1), (-1, 1))
+REVERSE = (3, 2, 1, 0)
+RED_DIRECTIONS = (0, 1)
+BLUE_DIRECTIONS = (2, 3)
+KING_DIRECTIONS = (0, 1, 2, 3)
+RED_KING_JUMP_DIRECTIONS = (0, 1, 2, 3)
+BLUE_KING_JUMP_DIRECTIONS = (2, 3, 0, 1)
+
+
+def _step(square, direction, distance):
+    row, col = SQUARE_POS[square]
+    dr, dc = DIRECTIONS[direction]
+    return SQUARE_INDEX.get((row + dr * distance, col + dc * distance), -1)
+
+
+NEIGHBOR = tuple(tuple(_step(sq, d, 1) for sq in range(32)) for d in range(4))
+JUMP_LANDING = tuple(tuple(_step(sq, d, 2) for sq in range(32)) for d in range(4))
+
+
+def popcount(mask):
+    return bin(mask).count("1")
+
+
+def shift(mask, direction):
+    if direction == 0:
+        return (((mask & EVEN_ROWS) << 4) | ((mask & ODD_ROWS & ~LEFT_EDGE) << 3)) & FULL
+    if direction == 1:
+        return (((mask & EVEN_ROWS & ~RIGHT_EDGE) << 5) | ((mask & ODD_ROWS) << 4)) & FULL
+    if direction == 2:
+        return ((mask & EVEN_ROWS) >> 4) | ((mask & ODD_ROWS & ~LEFT_EDGE) >> 5)
+    return ((mask & EVEN_ROWS & ~RIGHT_EDGE) >> 3) | ((mask & ODD_ROWS) >> 4)
+
+
+def _find_jumps(square, directions, opponent, empty, path, visited, found):
+    extended = False
+    for direction in directions:
+        landing = JUMP_LANDING[direction][square]
+        if landing < 0:
+            continue
+        bit = 1 << landing
+        if empty & bit and not visited & bit and opponent >> NEIGHBOR[direction][square] & 1:
+            path.append(SQUARE_POS[landing])
+            _find_jumps(landing, directions, opponent, empty, path, visited | bit, found)
+            path.pop()
+            extended = True
+    if not extended and len(path) > 1:
+        found.append(path[:])
+
+
+def _sides(red, blue, color):
+    if color == "RED":
+        return red, blue, RED_DIRECTIONS, RED_KING_JUMP_DIRECTIONS
+    return blue, red, BLUE_DIRECTIONS, BLUE_KING_JUMP_DIRECTIONS
+
+
+def _movers(own, opponent, kings, man_directions):
+    empty = ~(own | opponent) & FULL
+    own_kings = own & kings
+    movers = []
+    jumpers = []
+    for direction in range(4):
+        pieces = own if direction in man_directions else own_kings
+        open_squares = shift(empty, REVERSE[direction])
+        movers.append(pieces & open_squares)
+        jumpers.append(pieces & shift(opponent & open_squares, REVERSE[direction]))
+    return empty, movers, jumpers
+
+
+def count_moves(red, blue, kings, color, must_jump):
+    own, opponent, man_directions, king_jump_directions = _sides(red, blue, color)
+    empty, movers, jumpers = _movers(own, opponent, kings, man_directions)
+    total_jumps = 0
+    any_jumper = jumpers[0] | jumpers[1] | jumpers[2] | jumpers[3]
+    while any_jumper:
+        low = any_jumper & -any_jumper
+        any_jumper ^= low
+        square = low.bit_length() - 1
+        piece_jumps = []
+        _find_jumps(square, king_jump_directions if kings & low else man_directions,
+                    opponent, empty, [SQUARE_POS[square]], low, piece_jumps)
+        total_jumps += len(piece_jumps)
+    if must_jump and total_jumps:
+        return total_jumps
+    return popcount(movers[0]) + popcount(movers[1]) + popcount(movers[2]) + popcount(movers[3]) + total_jumps
@@ -0,0 +1,27 @@
+def opponent(color):
+    return "BLUE" if color == "RED" else "RED"
+
+
+def is_jump_move(move):
+    # A jump carries its whole path; a simple move only its destination.
+    return isinstance(move[1], list)
+
+
+def listed(moves, jumps):
+    return [(start_pos, move_data) for start_pos, move_list in jumps.items() for move_data in move_list] + \
+           [(start_pos, move_data) for start_pos, move_list in moves.items() for move_data in move_list]
+
+
+def legal_moves(board, color=None, must_jump=None):
+    # Works on Board and BitBoard alike. Moves are (start_pos, move_data) pairs, jumps first.
+    color = board.turn if color is None else color
+    must_jump = board.must_jump if must_jump is None else must_jump
+    return listed(*board.get_all_moves(color, must_jump))
+
+
+def play(board, move, print_move=False):
+    start_pos, move_data = move
+    if is_jump_move(move):
+        board.play_jump(move_data, print_move)
+    else:
+        board.play_move(start_pos, move_data, print_move)
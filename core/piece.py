@@ -38,23 +38,6 @@ class Piece:
         return None
 
 
-def board_to_cache_key(board):
-    key = ""
-    for row in board:
-        for cell in row:
-            if cell == Piece.RED:
-                key += "r"
-            elif cell == Piece.BLUE:
-                key += "b"
-            elif cell == Piece.RED_KING:
-                key += "R"
-            elif cell == Piece.BLUE_KING:
-                key += "B"
-            else:
-                key += "0"
-    return key
-
-
 def cache_key_to_board(key):
     board = [[Piece.EMPTY for _ in range(8)] for _ in range(8)]
     for i in range(64):
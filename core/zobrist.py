@@ -0,0 +1,27 @@
+import random
+
+from core.piece import Piece
+
+# Fixed seed so keys stay stable across runs and persisted caches remain valid.
+_rng = random.Random(0x5EED)
+
+PIECE_KEYS = {
+    piece: tuple(_rng.getrandbits(64) for _ in range(64))
+    for piece in (Piece.RED, Piece.BLUE, Piece.RED_KING, Piece.BLUE_KING)
+}
+RED_TO_MOVE_KEY = _rng.getrandbits(64)
+MUST_JUMP_KEY = _rng.getrandbits(64)
+
+
+def hash_board(board, turn, must_jump):
+    key = 0
+    for row in range(8):
+        for col in range(8):
+            piece = board[row][col]
+            if piece != Piece.EMPTY:
+                key ^= PIECE_KEYS[piece][row * 8 + col]
+    if turn == "RED":
+        key ^= RED_TO_MOVE_KEY
+    if must_jump:
+        key ^= MUST_JUMP_KEY
+    return key
@@ -1,69 +1,510 @@
+import json
+import os
+import time
+
+from core.bitboard import BitBoard
+from core.moves import is_jump_move, legal_moves, play
+from game.book import OpeningBook
+from game.endgame import EndgameDatabase
+from game.stats import InstrumentedBoard, SearchStats
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+class TranspositionTable:
+    # Rough CPython footprint of one stored entry tuple and its contents.
+    ENTRY_BYTES = 240
+
+    def __init__(self, size_mb=64):
+        # A size of zero turns the table off.
+        self.buckets = int(size_mb * 1024 * 1024 // (2 * self.ENTRY_BYTES))
+        # Each bucket has a depth-preferred slot and an always-replace slot.
+        self.deep = [None] * self.buckets
+        self.recent = [None] * self.buckets
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+        self.cutoffs = 0
+        self.nodes_saved = 0
+
+    def clear(self):
+        self.deep = [None] * self.buckets
+        self.recent = [None] * self.buckets
+
+    def get(self, key):
+        if not self.buckets:
+            return None
+        index = key % self.buckets
+        for entry in (self.deep[index], self.recent[index]):
+            if entry is not None and entry[0] == key:
+                return entry
+        return None
+
+    def probe(self, key):
+        self.probes += 1
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+        return entry
+
+    def store(self, key, depth, score, bound, best_move, nodes):
+        if not self.buckets:
+            return
+        index = key % self.buckets
+        entry = (key, depth, score, bound, best_move, nodes)
+        deep = self.deep[index]
+        if deep is None or deep[0] == key or depth >= deep[1]:
+            self.deep[index] = entry
+        else:
+            self.recent[index] = entry
+
+    def record_cutoff(self, entry):
+        self.cutoffs += 1
+        self.nodes_saved += entry[5]
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+
+class SearchTimeout(Exception):
+    pass
+
+
 class CheckersAI:
+    # How many nodes pass between clock checks during a timed search.
+    TIME_CHECK_INTERVAL = 256
+    MAX_PLY = 64
+    # Beyond any evaluation; a win found at a shallower ply scores higher.
+    WIN_SCORE = 1000
+    # Evaluations are sums of tenths, so a window this narrow separates any two different scores.
+    NULL_WINDOW = 1e-6
+    ASPIRATION_WINDOW = 2.0
+    # Selective search: quiet moves from this index on are reduced, and frontier moves this far
+    # below alpha are pruned (a little more than a man, enough to cover a forced exchange).
+    LATE_MOVE_INDEX = 3
+    FUTILITY_MARGIN = 3.0
 
-    def __init__(self, game_logic):
-        self.game_logic = game_logic
-
-    def minimax(self, board, depth, alpha, beta, maximizer):
-        if depth == 0 or self.game_logic.check_winner() != "NONE":
-            return board.evaluate(self.game_logic.must_jump), None
-
-        if maximizer:
-            max_eval = float('-inf')
-            best_move = None
-            moves, jumps = board.get_all_moves("RED", self.game_logic.must_jump)
-            move_dict = jumps if jumps else moves
-            for start_pos, move_list in move_dict.items():
-                for move_data in move_list:
-                    board_copy = board.copy()
-                    if jumps:
-                        board_copy.play_jump(move_data)
-                    else:
-                        board_copy.play_move(start_pos, move_data)
-                    evaluation = self.minimax(board_copy, depth - 1, alpha, beta, False)[0]
-                    if evaluation > max_eval:
-                        max_eval = evaluation
-                        best_move = (start_pos, move_data)
-                    alpha = max(alpha, evaluation)
-                    if beta <= alpha:
-                        break
-                if beta <= alpha:
-                    break
-            return max_eval, best_move
+    def __init__(self, use_bitboard=True, tt_size_mb=64, time_budget_ms=1000, max_depth=32, move_ordering=True,
+                 workers=1, endgame_path=None, book_path=None, collect_stats=False,
+                 pvs=True, selective=True):
+        self.use_bitboard = use_bitboard
+        self.endgame_path = endgame_path if endgame_path and os.path.exists(endgame_path) else None
+        self.endgame = EndgameDatabase(self.endgame_path) if self.endgame_path else None
+        self.book = OpeningBook(book_path) if book_path and os.path.exists(book_path) else None
+        self.tt_size_mb = tt_size_mb
+        self.tt = TranspositionTable(tt_size_mb)
+        self.workers = workers
+        self.parallel = None
+        self.time_budget_ms = time_budget_ms
+        self.max_depth = max_depth
+        self.move_ordering = move_ordering
+        self.pvs = pvs
+        self.selective = selective
+        self.deadline = float('inf')
+        self.ponder_started = None
+        self.ponder_deadline = float('inf')
+        self.cancelled = False
+        self.pv_moves = {}
+        self.killers = [[None, None] for _ in range(self.MAX_PLY)]
+        self.history = {}
+        self.current_depth = 0
+        self.best_move_so_far = None
+        self.evaluation_so_far = None
+        self.collect_stats = collect_stats
+        self.last_stats = None
+        self.reset_counters()
+
+    def order_moves(self, board, move_dict, is_jump, tt_move, ply):
+        ordered = [(start_pos, move_data) for start_pos, move_list in move_dict.items() for move_data in move_list]
+        if not self.move_ordering:
+            return ordered
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+
+        def priority(move):
+            start_pos, move_data = move
+            if move == tt_move:
+                return (4, 0)
+            end_pos = move_data[-1] if is_jump else move_data
+            promotes = board.promotes(start_pos, end_pos)
+            if is_jump:
+                return (3, 2 * (len(move_data) - 1) + promotes)
+            if promotes:
+                return (2, 0)
+            if move in killers:
+                return (1, -killers.index(move))
+            return (0, self.history.get(move, 0))
+
+        ordered.sort(key=priority, reverse=True)
+        return ordered
+
+    def record_cutoff(self, move, is_jump, depth, ply, move_index):
+        self.cutoffs += 1
+        if move_index == 0:
+            self.first_move_cutoffs += 1
+        if is_jump or ply >= len(self.killers):
+            return
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[move] = self.history.get(move, 0) + depth * depth
+
+    def reset_counters(self):
+        self.nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.tt.reset_stats()
+
+    def minimax(self, board, depth, alpha, beta, ply=0):
+        # Scores seen from RED for callers; the search itself is negamax from the side to move.
+        if board.turn == "RED":
+            return self.negamax(board, depth, alpha, beta, ply)
+        value, best_move = self.negamax(board, depth, -beta, -alpha, ply)
+        return -value, best_move
+
+    def negamax(self, board, depth, alpha, beta, ply=0):
+        if depth == 0 and self.selective:
+            return self.quiescence(board, alpha, beta, ply), None
+        self.nodes += 1
+        if self.nodes % self.TIME_CHECK_INTERVAL == 0 and (self.cancelled or time.perf_counter() > self.deadline):
+            raise SearchTimeout()
+        sign = 1 if board.turn == "RED" else -1
+        if depth == 0:
+            if self.endgame is not None:
+                score = self.endgame_score(board, ply)
+                if score is not None:
+                    return sign * score, None
+            return sign * board.evaluate(board.must_jump), None
+
+        nodes_before = self.nodes
+        alpha_orig, beta_orig = alpha, beta
+        entry = self.tt.probe(board.hash)
+        if entry is None:
+            tt_move = self.pv_moves.get(board.hash)
         else:
-            min_eval = float('inf')
-            best_move = None
-            moves, jumps = board.get_all_moves("BLUE", self.game_logic.must_jump)
-            move_dict = jumps if jumps else moves
-            for start_pos, move_list in move_dict.items():
-                for move_data in move_list:
-                    board_copy = board.copy()
-                    if jumps:
-                        board_copy.play_jump(move_data)
-                    else:
-                        board_copy.play_move(start_pos, move_data)
-                    evaluation = self.minimax(board_copy, depth - 1, alpha, beta, True)[0]
-                    if evaluation < min_eval:
-                        min_eval = evaluation
-                        best_move = (start_pos, move_data)
-                    beta = min(beta, evaluation)
-                    if beta <= alpha:
-                        break
+            tt_move = entry[4]
+            if entry[1] >= depth:
+                score, bound = self.score_from_tt(entry[2], ply), entry[3]
+                if bound == EXACT:
+                    self.tt.record_cutoff(entry)
+                    return score, tt_move
+                if bound == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
                 if beta <= alpha:
-                    break
-            return min_eval, best_move
+                    self.tt.record_cutoff(entry)
+                    return score, tt_move
 
-    def bot_move(self):
+        moves, jumps = board.get_all_moves(board.turn, board.must_jump)
+        if not moves and not jumps:
+            # No pieces or no legal move: the side to move has lost.
+            return ply - self.WIN_SCORE, None
+        is_jump = bool(jumps)
+        value = float('-inf')
+        best_move = None
+        # Quiet moves at the frontier that cannot lift a hopeless static score up to alpha are skipped.
+        futility = None
+        if self.selective and depth == 1 and ply > 0 and not is_jump and abs(alpha) < self.WIN_SCORE // 2:
+            futility = sign * board.evaluate(board.must_jump) + self.FUTILITY_MARGIN
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        for index, move in enumerate(self.order_moves(board, jumps if jumps else moves, is_jump, tt_move, ply)):
+            quiet = not is_jump and not board.promotes(move[0], move[1]) and move not in killers
+            if futility is not None and futility <= alpha and index > 0 and quiet:
+                value = max(value, futility)
+                continue
+            reduced = self.selective and depth >= 3 and index >= self.LATE_MOVE_INDEX and quiet
+            undo = board.make_move(move[0], move[1], is_jump)
+            if reduced:
+                # Late quiet moves are tried a ply shallower and only searched fully if they beat alpha.
+                score = -self.negamax(board, depth - 2, -alpha - self.NULL_WINDOW, -alpha, ply + 1)[0]
+            if not reduced or score > alpha:
+                if index == 0 or not self.pvs:
+                    score = -self.negamax(board, depth - 1, -beta, -alpha, ply + 1)[0]
+                else:
+                    # Later moves only have to be shown no better than the best so far.
+                    score = -self.negamax(board, depth - 1, -alpha - self.NULL_WINDOW, -alpha, ply + 1)[0]
+                    if alpha < score < beta:
+                        score = -self.negamax(board, depth - 1, -beta, -alpha, ply + 1)[0]
+            board.unmake_move(undo)
+            if best_move is None or score > value:
+                value = score
+                best_move = move
+            alpha = max(alpha, score)
+            if beta <= alpha:
+                self.record_cutoff(move, is_jump, depth, ply, index)
+                break
+
+        if value <= alpha_orig:
+            bound = UPPER
+        elif value >= beta_orig:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.tt.store(board.hash, depth, self.score_to_tt(value, ply), bound, best_move, self.nodes - nodes_before)
+        return value, best_move
+
+    def score_to_tt(self, score, ply):
+        # Wins and losses count plies from the root; the table keeps them counted from the node, so a
+        # position reached at another ply, or in the next search, gets the right distance to the result.
+        if score > self.WIN_SCORE // 2:
+            return score + ply
+        if score < -self.WIN_SCORE // 2:
+            return score - ply
+        return score
+
+    def score_from_tt(self, score, ply):
+        if score > self.WIN_SCORE // 2:
+            return score - ply
+        if score < -self.WIN_SCORE // 2:
+            return score + ply
+        return score
+
+    def quiescence(self, board, alpha, beta, ply):
+        # Plays out pending captures so the horizon never lands in the middle of an exchange.
+        self.nodes += 1
+        if self.nodes % self.TIME_CHECK_INTERVAL == 0 and (self.cancelled or time.perf_counter() > self.deadline):
+            raise SearchTimeout()
+        sign = 1 if board.turn == "RED" else -1
+        if self.endgame is not None:
+            score = self.endgame_score(board, ply)
+            if score is not None:
+                return sign * score
+        moves, jumps = board.get_all_moves(board.turn, board.must_jump)
+        if not moves and not jumps:
+            return ply - self.WIN_SCORE
+        if jumps and board.must_jump:
+            # A forced capture leaves no option to stand pat.
+            value = float('-inf')
+        else:
+            value = sign * board.evaluate(board.must_jump)
+            if not jumps or value >= beta:
+                return value
+            alpha = max(alpha, value)
+        for move in self.order_moves(board, jumps, True, None, ply):
+            undo = board.make_move(move[0], move[1], True)
+            score = -self.quiescence(board, -beta, -alpha, ply + 1)
+            board.unmake_move(undo)
+            value = max(value, score)
+            alpha = max(alpha, score)
+            if beta <= alpha:
+                break
+        return value
+
+    def root_search(self, board, depth, alpha=float('-inf'), beta=float('inf'), guess=None):
+        if self.workers <= 1 or not self.use_bitboard:
+            return self.minimax(board, depth, alpha, beta)
+        if self.parallel is None:
+            from game.parallel import ParallelSearch
+            self.parallel = ParallelSearch(self.workers, self.tt_size_mb, self.endgame_path, self.selective)
+        time_left = None if self.deadline == float('inf') else self.deadline - time.perf_counter()
+        if guess is not None and board.turn != "RED":
+            guess = -guess
+        evaluation, best_move, nodes = self.parallel.search_root(board, depth, self.best_move_so_far, time_left,
+                                                                 lambda: self.cancelled, guess)
+        self.nodes += nodes
+        return evaluation, best_move
+
+    def aspiration_search(self, board, depth, previous):
+        # Search a window around an earlier score and widen whichever side the result falls outside.
+        if previous is not None and abs(previous) > self.WIN_SCORE // 2:
+            previous = None
+        if self.workers > 1 and self.use_bitboard:
+            # The parallel search bounds the moves it starts at once by the earlier score itself.
+            return self.root_search(board, depth, guess=previous if self.pvs else None)
+        if not self.pvs or previous is None:
+            return self.root_search(board, depth)
+        below = above = self.ASPIRATION_WINDOW
+        while below < self.WIN_SCORE and above < self.WIN_SCORE:
+            alpha, beta = previous - below, previous + above
+            result = self.root_search(board, depth, alpha, beta)
+            if alpha < result[0] < beta:
+                return result
+            if result[0] <= alpha:
+                below *= 4
+            else:
+                above *= 4
+        return self.root_search(board, depth)
+
+    def close(self):
+        if self.parallel is not None:
+            self.parallel.close()
+
+    def endgame_score(self, board, ply):
+        value = self.endgame.probe_board(board)
+        if value is None:
+            return None
+        if value == 0:
+            return 0.0
+        score = self.WIN_SCORE - ply - (abs(value) - 1)
+        if value < 0:
+            score = -score
+        return score if board.turn == "RED" else -score
+
+    def endgame_move(self, board):
+        # A decided position is played straight from the database: the fastest win or the longest loss.
+        value = self.endgame.probe_board(board)
+        if not value:
+            return None
+        sign = 1 if board.turn == "RED" else -1
+        best_score, best_move = None, None
+        for move in legal_moves(board, must_jump=True):
+            undo = board.make_move(move[0], move[1], is_jump_move(move))
+            score = self.endgame_score(board, 1)
+            if score is None:
+                score = -sign * self.negamax(board, 1, float('-inf'), float('inf'), 1)[0]
+            board.unmake_move(undo)
+            if best_move is None or sign * score > sign * best_score:
+                best_score, best_move = score, move
+        return best_score, best_move
+
+    def principal_variation(self, board, depth):
+        pv = []
+        undos = []
+        for ply in range(depth):
+            entry = self.tt.get(board.hash)
+            if entry is None or entry[4] is None:
+                break
+            start_pos, move_data = entry[4]
+            pv.append((board.hash, entry[4]))
+            undos.append(board.make_move(start_pos, move_data, is_jump_move(entry[4])))
+        for undo in reversed(undos):
+            board.unmake_move(undo)
+        return pv
+
+    def search(self, board, max_depth, time_budget_ms=None):
+        if not self.collect_stats:
+            return self._search(board, max_depth, time_budget_ms)
+        stats = SearchStats(self)
+        stats.attach()
+        try:
+            result = self._search(InstrumentedBoard(board, stats), max_depth, time_budget_ms)
+        finally:
+            stats.detach()
+        self.last_stats = stats.report(result[2])
+        return result
+
+    def _search(self, board, max_depth, time_budget_ms):
+        start = time.perf_counter()
+        # The first iteration always completes so there is a move to play.
+        self.deadline = float('inf')
+        self.pv_moves = {}
+        self.killers = [[None, None] for _ in range(self.MAX_PLY)]
+        # Age the history table so old games do not dominate the ordering.
+        self.history = {move: score // 2 for move, score in self.history.items() if score > 1}
+        evaluation, best_move, completed_depth = None, None, 0
+        scores = []
+        self.best_move_so_far = None
+        self.evaluation_so_far = None
+        if self.book is not None:
+            book_move = self.book.lookup(board, legal_moves(board, must_jump=True))
+            if book_move is not None:
+                self.evaluation_so_far, self.best_move_so_far = board.evaluate(board.must_jump), book_move
+                return self.evaluation_so_far, book_move, 0
+        if self.endgame is not None:
+            result = self.endgame_move(board)
+            if result is not None and result[1] is not None:
+                self.evaluation_so_far, self.best_move_so_far = result
+                return result[0], result[1], 0
+        for depth in range(1, max_depth + 1):
+            self.current_depth = depth
+            try:
+                # Scores swing between odd and even depths, so the window is centred on the same parity.
+                result = self.aspiration_search(board, depth, scores[-2] if len(scores) > 1 else None)
+            except SearchTimeout:
+                break
+            evaluation, best_move = result
+            scores.append(evaluation)
+            completed_depth = depth
+            self.evaluation_so_far, self.best_move_so_far = result
+            self.pv_moves = dict(self.principal_variation(board, depth))
+            if time_budget_ms is not None:
+                self.deadline = start + time_budget_ms / 1000
+            self.deadline = min(self.deadline, self.ponder_deadline)
+            if time.perf_counter() > self.deadline:
+                break
+            # Scores this far out are proven results, not evaluations.
+            if best_move is None or abs(evaluation) > self.WIN_SCORE // 2:
+                break
+        self.deadline = float('inf')
+        return evaluation, best_move, completed_depth
+
+    def progress(self):
+        return {
+            "depth": self.current_depth,
+            "nodes": self.nodes,
+            "best_move": self.best_move_so_far,
+            "evaluation": self.evaluation_so_far,
+        }
+
+    def fixed_depth(self, board):
         max_depth = 6
         min_depth = 4
-        total_pieces = self.game_logic.board.red_pieces + self.game_logic.board.red_kings + self.game_logic.board.blue_pieces + self.game_logic.board.blue_kings
+        total_pieces = board.red_pieces + board.red_kings + board.blue_pieces + board.blue_kings
         initial_pieces = 24
-        depth = min_depth + round((1 - total_pieces / initial_pieces) * (max_depth - min_depth))
-        print(f"Bot thinking at depth {depth}...")
-        evaluation, best_move = self.minimax(self.game_logic.board, depth, float('-inf'), float('inf'), True)
-        if best_move:
-            start_pos, move_data = best_move
-            moves, jumps = self.game_logic.board.get_all_moves("RED", self.game_logic.must_jump)
-            if jumps and start_pos in jumps:
-                self.game_logic.board.play_jump(move_data, True)
-            elif moves and start_pos in moves:
-                self.game_logic.board.play_move(start_pos, move_data, True)
+        return min_depth + round((1 - total_pieces / initial_pieces) * (max_depth - min_depth))
+
+    def search_board(self, board):
+        if self.use_bitboard:
+            return BitBoard.from_board(board)
+        return board.copy()
+
+    def depth_limit(self, board):
+        return self.fixed_depth(board) if self.time_budget_ms is None else self.max_depth
+
+    def think(self, board, pondering=False):
+        max_depth = self.depth_limit(board)
+        if not pondering:
+            self.ponder_deadline = float('inf')
+        if pondering:
+            print("Bot pondering the expected reply...")
+        elif self.time_budget_ms is None:
+            print(f"Bot thinking at depth {max_depth}...")
+        else:
+            print(f"Bot thinking for up to {self.time_budget_ms} ms...")
+        self.reset_counters()
+        start = time.perf_counter()
+        # A ponder search has no budget of its own until ponderhit gives it one.
+        evaluation, best_move, depth = self.search(board, max_depth, None if pondering else self.time_budget_ms)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Searched {self.nodes} nodes to depth {depth} in {elapsed_ms:.0f} ms; "
+              f"{self.first_move_cutoffs}/{self.cutoffs} cutoffs on the first move; transposition table hit rate "
+              f"{self.tt.hit_rate():.0%}, {self.tt.cutoffs} cutoffs saved ~{self.tt.nodes_saved} nodes.")
+        if self.book is not None:
+            print(f"Opening book hit rate {self.book.hit_rate():.0%} ({self.book.hits}/{self.book.lookups} moves).")
+        if self.collect_stats:
+            print(f"Search stats: {json.dumps(self.last_stats)}")
+        return evaluation, best_move, depth
+
+    def expected_reply(self, board):
+        entry = self.tt.get(board.hash)
+        if entry is None or entry[4] is None:
+            return None
+        # The stored move is checked against the legal ones in case of a hash collision.
+        if entry[4] in legal_moves(board, must_jump=True):
+            return entry[4]
+        return None
+
+    def ponder(self, board):
+        self.ponder_started = time.perf_counter()
+        self.ponder_deadline = float('inf')
+        return self.think(board, pondering=True)
+
+    def ponderhit(self):
+        # The expected reply was played, so the ponder search now answers it. Its budget counts from
+        # when pondering began; a deadline mid-way through the first iteration waits for it to finish.
+        if self.time_budget_ms is not None and self.ponder_started is not None:
+            self.ponder_deadline = self.ponder_started + self.time_budget_ms / 1000
+            if self.best_move_so_far is not None:
+                self.deadline = self.ponder_deadline
+
+    def play(self, board, best_move):
+        if best_move and best_move in legal_moves(board):
+            play(board, best_move, True)
+
+    def bot_move(self, board):
+        self.play(board, self.think(self.search_board(board))[1])
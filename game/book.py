@@ -0,0 +1,185 @@
+import json
+import mmap
+import os
+import random
+import struct
+import time
+
+from core.bitboard import SQUARE_INDEX, SQUARE_POS, BitBoard
+from core.board import Board
+from core.moves import is_jump_move, play
+
+BOOK_FILE = os.path.join("data", "book.bin")
+MAGIC = b"CKBOOK01"
+HEADER = struct.Struct("<8sQ")
+# Position hash, weight, path length (high bit set for jumps) and up to 13 squares of path.
+RECORD = struct.Struct("<QHB13s")
+MAX_PATH = 13
+JUMP_FLAG = 0x80
+
+
+def encode_move(move):
+    start_pos, move_data = move
+    is_jump = is_jump_move(move)
+    path = move_data if is_jump else [start_pos, move_data]
+    if len(path) > MAX_PATH:
+        return None
+    return (len(path) | (JUMP_FLAG if is_jump else 0)), bytes(SQUARE_INDEX[tuple(pos)] for pos in path)
+
+
+def decode_move(length, squares):
+    path = [SQUARE_POS[square] for square in squares[:length & ~JUMP_FLAG]]
+    if length & JUMP_FLAG:
+        return path[0], path
+    return path[0], path[1]
+
+
+class OpeningBook:
+
+    def __init__(self, path=BOOK_FILE, seed=None):
+        self.path = path
+        self.rng = random.Random(seed)
+        self.data = None
+        self.count = 0
+        self.lookups = 0
+        self.hits = 0
+
+    def _open(self):
+        # Mapped on the first lookup so an unused book costs nothing at startup.
+        if self.data is None:
+            if not os.path.exists(self.path):
+                self.data = b""
+                return
+            with open(self.path, "rb") as file:
+                self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self.count = HEADER.unpack_from(self.data, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not an opening book")
+
+    def _key(self, index):
+        return struct.unpack_from("<Q", self.data, HEADER.size + index * RECORD.size)[0]
+
+    def candidates(self, key):
+        self._open()
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        found = []
+        while low < self.count and self._key(low) == key:
+            record_key, weight, length, squares = RECORD.unpack_from(self.data, HEADER.size + low * RECORD.size)
+            found.append((decode_move(length, squares), weight))
+            low += 1
+        return found
+
+    def lookup(self, board, legal_moves):
+        self.lookups += 1
+        # Only moves that are legal here count, which also guards against hash collisions.
+        candidates = [(move, weight) for move, weight in self.candidates(board.hash) if move in legal_moves]
+        if not candidates:
+            return None
+        self.hits += 1
+        moves, weights = zip(*candidates)
+        return self.rng.choices(moves, weights)[0]
+
+    def hit_rate(self):
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.data = None
+
+
+def write_book(entries, path=BOOK_FILE):
+    records = []
+    for key, moves in entries.items():
+        for (length, squares), weight in moves.items():
+            records.append((key, min(weight, 0xFFFF), length, squares))
+    records.sort()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, len(records)))
+        for record in records:
+            file.write(RECORD.pack(*record))
+    return len(records)
+
+
+def _add(entries, key, move, weight):
+    encoded = encode_move(move)
+    if encoded is not None:
+        moves = entries.setdefault(key, {})
+        moves[encoded] = moves.get(encoded, 0) + weight
+
+
+def _as_move(move):
+    start_pos, move_data = move
+    if move_data and isinstance(move_data[0], list):
+        return tuple(start_pos), [tuple(pos) for pos in move_data]
+    return tuple(start_pos), tuple(move_data)
+
+
+def add_selfplay(entries, path, plies):
+    # Each book move is weighted by how its side fared: two for a win, one for a draw.
+    with open(path) as file:
+        for line in file:
+            game = json.loads(line)
+            board = Board(game["must_jump"])
+            for entry in game["moves"][:plies]:
+                move = _as_move(entry["move"])
+                if not entry.get("random"):
+                    weight = 1 if game["winner"] == "DRAW" else 2 * (game["winner"] == entry["side"])
+                    if weight:
+                        _add(entries, board.hash, move, weight)
+                play(board, move)
+
+
+def add_searches(entries, ai, must_jump, plies, depth, log=print):
+    # Every line up to the given number of plies gets the move a deep search prefers.
+    frontier = [BitBoard(must_jump)]
+    for ply in range(plies):
+        start = time.perf_counter()
+        next_frontier = {}
+        for board in frontier:
+            moves, jumps = board.get_all_moves(board.turn, must_jump)
+            if not moves and not jumps:
+                continue
+            best_move = ai.search(board, depth)[1]
+            _add(entries, board.hash, best_move, 1)
+            for start_pos, move_list in (jumps if jumps else moves).items():
+                for move_data in move_list:
+                    child = board.copy()
+                    child.make_move(start_pos, move_data, bool(jumps))
+                    next_frontier.setdefault(child.hash, child)
+        log(f"ply {ply}: searched {len(frontier)} positions at depth {depth} in {time.perf_counter() - start:.1f}s")
+        frontier = list(next_frontier.values())
+
+
+def main():
+    # game.ai imports this module for OpeningBook, so the builder's imports wait until it runs.
+    import argparse
+    from game.ai import CheckersAI
+
+    parser = argparse.ArgumentParser(description="Build the opening book.")
+    parser.add_argument("--output", default=BOOK_FILE)
+    parser.add_argument("--selfplay", nargs="*", default=[], help="self-play JSONL files to learn from")
+    parser.add_argument("--selfplay-plies", type=int, default=12)
+    parser.add_argument("--search-plies", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=8)
+    args = parser.parse_args()
+
+    entries = {}
+    for path in args.selfplay:
+        add_selfplay(entries, path, args.selfplay_plies)
+    if args.search_plies:
+        ai = CheckersAI(time_budget_ms=None)
+        for must_jump in (True, False):
+            add_searches(entries, ai, must_jump, args.search_plies, args.depth)
+    print(f"Wrote {write_book(entries, args.output)} book moves for {len(entries)} positions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
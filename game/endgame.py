@@ -0,0 +1,256 @@
+import itertools
+import mmap
+import os
+import struct
+import time
+from array import array
+from math import comb
+
+from core.bitboard import BOTTOM_ROW, TOP_ROW, BitBoard, popcount
+from core.moves import is_jump_move, legal_moves, opponent
+
+ENDGAME_FILE = os.path.join("data", "endgame.db")
+MAGIC = b"CKEG0001"
+HEADER = struct.Struct("<8sII")
+SIGNATURE = struct.Struct("<BBBBQ")
+
+# Stored values are from the side to move's point of view:
+# 0 is a draw, d + 1 a win in d plies and -(d + 1) a loss in d plies.
+MAX_DISTANCE = 126
+NO_LOSS = 1 << 15
+
+COMB = [[comb(n, k) for k in range(33)] for n in range(33)]
+
+
+def _rank(mask):
+    # Colex rank of the set squares among all subsets of the 32 squares of the same size.
+    rank = 0
+    count = 0
+    while mask:
+        low = mask & -mask
+        mask ^= low
+        count += 1
+        rank += COMB[low.bit_length() - 1][count]
+    return rank
+
+
+def _signature(red, blue, kings):
+    return (popcount(red & ~kings), popcount(red & kings), popcount(blue & ~kings), popcount(blue & kings))
+
+
+def _signature_size(signature):
+    size = 2
+    for count in signature:
+        size *= COMB[32][count]
+    return size
+
+
+def _index(signature, red, blue, kings, turn):
+    index = 0
+    for mask, count in zip((red & ~kings, red & kings, blue & ~kings, blue & kings), signature):
+        index = index * COMB[32][count] + _rank(mask)
+    return index * 2 + (turn == "RED")
+
+
+def signatures(max_pieces):
+    # Fewer pieces first, then fewer men, so captures and promotions lead to solved tables.
+    found = []
+    for pieces in range(2, max_pieces + 1):
+        for signature in itertools.product(range(pieces + 1), repeat=4):
+            red_men, red_kings, blue_men, blue_kings = signature
+            if sum(signature) == pieces and red_men + red_kings and blue_men + blue_kings:
+                found.append(signature)
+    return sorted(found, key=lambda signature: (sum(signature), signature[0] + signature[2]))
+
+
+class EndgameDatabase:
+
+    def __init__(self, path=ENDGAME_FILE):
+        self.path = path
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.max_pieces, count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an endgame database")
+        self.offsets = {}
+        for i in range(count):
+            red_men, red_kings, blue_men, blue_kings, offset = SIGNATURE.unpack_from(
+                self.data, HEADER.size + i * SIGNATURE.size)
+            self.offsets[(red_men, red_kings, blue_men, blue_kings)] = offset
+
+    def close(self):
+        self.data.close()
+
+    def probe(self, red, blue, kings, turn):
+        if popcount(red | blue) > self.max_pieces:
+            return None
+        signature = _signature(red, blue, kings)
+        offset = self.offsets.get(signature)
+        if offset is None:
+            return None
+        value = self.data[offset + _index(signature, red, blue, kings, turn)]
+        return value - 256 if value > 127 else value
+
+    def probe_board(self, board):
+        return self.probe(*board.bitmasks(), board.turn)
+
+
+def _children(board):
+    for move in legal_moves(board, must_jump=True):
+        undo = board.make_move(move[0], move[1], is_jump_move(move))
+        yield board.red, board.blue, board.kings
+        board.unmake_move(undo)
+
+
+_database = None
+
+
+def _init_worker(path):
+    global _database
+    _database = EndgameDatabase(path)
+
+
+def _solve_chunk(task):
+    signature, pairs = task
+    red_men, red_kings, blue_men, blue_kings = signature
+    parents, counts, children = array("i"), array("i"), array("i")
+    exit_loss, exit_win, exit_all_win = array("i"), array("i"), array("b")
+    board = BitBoard(True, 0, 0, 0)
+    for red_men_mask, red_kings_mask in pairs:
+        red = red_men_mask | red_kings_mask
+        free = [sq for sq in range(32) if not red >> sq & 1]
+        for blue_men_squares in itertools.combinations([sq for sq in free if not TOP_ROW >> sq & 1], blue_men):
+            blue_men_mask = sum(1 << sq for sq in blue_men_squares)
+            for blue_kings_squares in itertools.combinations([sq for sq in free if not blue_men_mask >> sq & 1],
+                                                             blue_kings):
+                blue = blue_men_mask | sum(1 << sq for sq in blue_kings_squares)
+                kings = red_kings_mask | (blue & ~blue_men_mask)
+                for turn in ("BLUE", "RED"):
+                    board.red, board.blue, board.kings, board.turn = red, blue, kings, turn
+                    count, loss, win, all_win = 0, NO_LOSS, -1, True
+                    child_turn = opponent(turn)
+                    for child_red, child_blue, child_kings in _children(board):
+                        if not (child_red if child_turn == "RED" else child_blue):
+                            loss = 0
+                            all_win = False
+                            continue
+                        child_signature = _signature(child_red, child_blue, child_kings)
+                        if child_signature == signature:
+                            children.append(_index(signature, child_red, child_blue, child_kings, child_turn))
+                            count += 1
+                            continue
+                        value = _database.probe(child_red, child_blue, child_kings, child_turn)
+                        if value > 0:
+                            win = max(win, value - 1)
+                        else:
+                            all_win = False
+                            if value < 0:
+                                loss = min(loss, -value - 1)
+                    parents.append(_index(signature, red, blue, kings, turn))
+                    counts.append(count)
+                    exit_loss.append(loss)
+                    exit_win.append(win)
+                    exit_all_win.append(all_win)
+    return parents, counts, children, exit_loss, exit_win, exit_all_win
+
+
+def _tasks(signature, chunk_size=64):
+    red_men, red_kings, blue_men, blue_kings = signature
+    pairs = []
+    for red_men_squares in itertools.combinations([sq for sq in range(32) if not BOTTOM_ROW >> sq & 1], red_men):
+        red_men_mask = sum(1 << sq for sq in red_men_squares)
+        for red_kings_squares in itertools.combinations([sq for sq in range(32) if not red_men_mask >> sq & 1],
+                                                        red_kings):
+            pairs.append((red_men_mask, sum(1 << sq for sq in red_kings_squares)))
+    return [(signature, pairs[i:i + chunk_size]) for i in range(0, len(pairs), chunk_size)]
+
+
+def _solve(np, size, results):
+    parents, counts, children, exit_loss, exit_win, exit_all_win = (
+        np.concatenate([np.frombuffer(result[i], dtype=result[i].typecode) for result in results]).astype(np.int64)
+        for i in range(6))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    has_children = counts > 0
+    # Children are looked up by signature index; the per-parent tables are indexed by row.
+    result = np.zeros(size, dtype=np.int8)
+    distance = np.full(size, -1, dtype=np.int64)
+    unresolved = np.ones(len(parents), dtype=bool)
+    last_exit = max(int(exit_loss[exit_loss < NO_LOSS].max(initial=-1)), int(exit_win.max(initial=-1)))
+
+    def per_parent(reduce, values, empty):
+        # reduceat needs non-empty segments, so parents without children are filled in separately.
+        reduced = np.full(len(parents), empty, dtype=values.dtype)
+        if len(children):
+            reduced[has_children] = reduce.reduceat(values, starts[has_children])
+        return reduced
+
+    ply = 0
+    while True:
+        child_result = result[children]
+        child_distance = distance[children]
+        any_loss = per_parent(np.logical_or, (child_result == -1) & (child_distance == ply - 1), False)
+        wins = per_parent(np.add, (child_result == 1).astype(np.int64), 0)
+        longest_win = per_parent(np.maximum, np.where(child_result == 1, child_distance, -1), -1)
+        win_now = unresolved & (any_loss | (exit_loss == ply - 1))
+        loss_now = unresolved & ~win_now & (wins == counts) & (exit_all_win == 1) \
+            & (np.maximum(longest_win, exit_win) == ply - 1)
+        for mask, value in ((win_now, 1), (loss_now, -1)):
+            result[parents[mask]] = value
+            distance[parents[mask]] = ply
+        unresolved &= ~(win_now | loss_now)
+        ply += 1
+        if not (win_now.any() or loss_now.any()) and ply > last_exit + 1:
+            break
+    if distance.max(initial=-1) >= MAX_DISTANCE:
+        raise ValueError("distance to win does not fit the table format")
+    return np.where(result == 0, 0, result * (distance + 1)).astype(np.int8)
+
+
+def build(max_pieces=4, path=ENDGAME_FILE, processes=None, log=print):
+    # Only the builder needs these, so probing the database does not import them.
+    import multiprocessing
+    import numpy as np
+
+    order = signatures(max_pieces)
+    offsets = {}
+    offset = HEADER.size + SIGNATURE.size * len(order)
+    for signature in order:
+        offsets[signature] = offset
+        offset += _signature_size(signature)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    partial = path + ".partial"
+    with open(partial, "wb") as file:
+        file.write(HEADER.pack(MAGIC, max_pieces, len(order)))
+        for signature in order:
+            file.write(SIGNATURE.pack(*signature, offsets[signature]))
+        file.truncate(offset)
+
+    start = time.perf_counter()
+    with open(partial, "r+b") as file, mmap.mmap(file.fileno(), 0) as data:
+        # Workers read the tables solved so far straight from the file being written.
+        with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(partial,)) as pool:
+            for signature in order:
+                results = list(pool.imap_unordered(_solve_chunk, _tasks(signature)))
+                table = _solve(np, _signature_size(signature), results)
+                data[offsets[signature]:offsets[signature] + len(table)] = table.tobytes()
+                data.flush()
+                log(f"{signature}: {len(table)} entries, {np.count_nonzero(table > 0)} wins, "
+                    f"{np.count_nonzero(table < 0)} losses ({time.perf_counter() - start:.0f}s)")
+    os.replace(partial, path)
+    return path
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the endgame database by retrograde analysis.")
+    parser.add_argument("--pieces", type=int, default=4)
+    parser.add_argument("--output", default=ENDGAME_FILE)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+    build(args.pieces, args.output, args.processes)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 from core.board import Board
+from core.moves import is_jump_move
 from ui.gui import CheckersGUI
 from game.ai import CheckersAI
+from game.book import BOOK_FILE
+from game.endgame import ENDGAME_FILE
+from game.worker import SearchWorker
 from utils.cache import save_cache, cache
 import pygame
 
@@ -12,7 +16,8 @@ class GameLogic:
         self.must_jump = must_jump
         self.board = Board(self.must_jump)
         self.gui = CheckersGUI(self.board, must_jump)
-        self.ai = CheckersAI(self)
+        self.ai = CheckersAI(endgame_path=ENDGAME_FILE, book_path=BOOK_FILE)
+        self.worker = SearchWorker(self.ai)
 
     def start(self):
 
@@ -33,6 +38,9 @@ class GameLogic:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+
+                elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    self.gui.invalidate()
                     
                 elif event.type == pygame.MOUSEBUTTONDOWN and not bot_thinking:
                     if self.gui.current_player == "BLUE":
@@ -46,22 +54,43 @@ class GameLogic:
                             self.gui.current_player = "RED"
                             message = "Bot is thinking..."
                             bot_thinking = True
+                            self.worker.start(self.board)
                             
-            self.gui.render(message)
-            
+            if not running:
+                break
+
             if bot_thinking:
-                pygame.time.wait(300)
-                self.ai.bot_move()
-                save_cache(cache, self.must_jump)
-                bot_thinking = False
-                message = ""
-                self.gui.current_player = "BLUE"
-                self.gui.selected_piece = None
-                self.gui.valid_moves = []
-                self.gui.valid_jumps = []
+                result = self.worker.poll()
+                if result is None:
+                    message = self.progress_message(self.worker.progress())
+                else:
+                    self.ai.play(self.board, result[1])
+                    save_cache(cache)
+                    bot_thinking = False
+                    message = ""
+                    self.gui.current_player = "BLUE"
+                    self.gui.selected_piece = None
+                    self.gui.valid_moves = []
+                    self.gui.valid_jumps = []
+                    if self.check_winner() == "NONE":
+                        # Think on the expected reply while the player decides.
+                        self.worker.ponder(self.board)
+
+            self.gui.render(message)
                 
+        self.worker.cancel()
+        self.ai.close()
         self.gui.quit()
 
+    @staticmethod
+    def progress_message(progress):
+        message = f"Bot is thinking... depth {progress['depth']}, {progress['nodes']} nodes"
+        if progress["best_move"]:
+            start_pos, move_data = progress["best_move"]
+            end_pos = move_data[-1] if is_jump_move(progress["best_move"]) else move_data
+            message += f", best so far {start_pos} -> {end_pos}"
+        return message
+
     def check_winner(self):
 
         if (self.board.red_pieces == 0 and self.board.red_kings == 0) or not self.board.get_all_moves("RED", self.must_jump):
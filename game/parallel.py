@@ -0,0 +1,137 @@
+import multiprocessing
+import os
+import sys
+import time
+
+from core.bitboard import BitBoard
+from core.moves import is_jump_move, legal_moves
+from game.ai import CheckersAI, SearchTimeout
+
+_worker_ai = None
+_worker_root = None
+
+
+def _init_worker(tt_size_mb, endgame_path, selective):
+    global _worker_ai
+    _worker_ai = CheckersAI(tt_size_mb=tt_size_mb, time_budget_ms=None, endgame_path=endgame_path,
+                            selective=selective)
+
+
+def _search_move(task):
+    index, position, move, depth, alpha, time_left = task
+    red, blue, kings, turn, must_jump = position
+    board = BitBoard(must_jump, red, blue, kings, turn)
+    global _worker_root
+    ai = _worker_ai
+    # The table carries over between tasks and iterations. A new root position starts fresh killers
+    # and aged history, as a serial search does.
+    if board.hash != _worker_root:
+        _worker_root = board.hash
+        ai.killers = [[None, None] for _ in range(ai.MAX_PLY)]
+        ai.history = {move: score // 2 for move, score in ai.history.items() if score > 1}
+    ai.reset_counters()
+    ai.deadline = float('inf') if time_left is None else time.perf_counter() + time_left
+    start_pos, move_data = move
+    board.make_move(start_pos, move_data, is_jump_move(move))
+    try:
+        # Scores are kept from the side to move's point of view.
+        value = -ai.negamax(board, depth - 1, float('-inf'), -alpha, 1)[0]
+    except SearchTimeout:
+        return index, None, alpha, ai.nodes
+    return index, value, alpha, ai.nodes
+
+
+def _just_below(value):
+    if value == float('inf'):
+        return sys.float_info.max
+    # Distinct evaluations differ by at least 0.1, so only an exact tie clears this.
+    return value - 1e-9
+
+
+class ParallelSearch:
+
+    def __init__(self, workers=None, tt_size_mb=64, endgame_path=None, selective=True):
+        self.workers = workers or os.cpu_count() or 1
+        self.tt_size_mb = tt_size_mb
+        self.endgame_path = endgame_path
+        self.selective = selective
+        self.pools = []
+
+    def _ensure_pool(self):
+        # One single-process pool per worker. Root move i always goes to pool i % workers, and a pool runs
+        # its tasks in order, so each worker's table sees the same tasks in the same order on every run.
+        if not self.pools:
+            self.pools = [multiprocessing.Pool(1, initializer=_init_worker,
+                                               initargs=(self.tt_size_mb, self.endgame_path, self.selective))
+                          for _ in range(self.workers)]
+
+    def close(self):
+        for pool in self.pools:
+            pool.terminate()
+            pool.join()
+        self.pools = []
+
+    def _run(self, tasks, should_stop):
+        pending = [self.pools[task[0] % self.workers].apply_async(_search_move, (task,)) for task in tasks]
+        results = []
+        nodes = 0
+        for async_result in pending:
+            while not async_result.ready():
+                if should_stop():
+                    self.close()
+                    raise SearchTimeout()
+                async_result.wait(0.02)
+            index, value, alpha, task_nodes = async_result.get()
+            nodes += task_nodes
+            if value is None:
+                raise SearchTimeout()
+            results.append((index, value, alpha))
+        return results, nodes
+
+    def search_root(self, board, depth, first_move=None, time_left=None, should_stop=lambda: False, guess=None):
+        # Like the serial search, only jumps are considered when there are any.
+        root = legal_moves(board, must_jump=True)
+        if not root:
+            return -CheckersAI.WIN_SCORE if board.turn == "RED" else CheckersAI.WIN_SCORE, None, 1
+        self._ensure_pool()
+        position = (board.red, board.blue, board.kings, board.turn, board.must_jump)
+        order = list(range(len(root)))
+        if first_move in root:
+            order.remove(root.index(first_move))
+            order.insert(0, root.index(first_move))
+
+        # Alpha bounds are fixed for the iteration so the results do not depend on the order tasks finish in.
+        deadline = None if time_left is None else time.perf_counter() + time_left
+        remaining = lambda: None if deadline is None else max(0.0, deadline - time.perf_counter())
+        results, nodes = None, 0
+        if guess is not None:
+            # With a score from an earlier iteration every move starts at once, against a bound just below it.
+            alpha = guess - CheckersAI.ASPIRATION_WINDOW
+            results, nodes = self._run([(i, position, root[i], depth, alpha, remaining()) for i in order],
+                                       should_stop)
+            if not any(value > alpha for index, value, alpha in results):
+                results = None
+        if results is None:
+            # The eldest move is searched alone with a full window; its score is the alpha bound for the rest.
+            results, eldest_nodes = self._run([(order[0], position, root[order[0]], depth, float('-inf'),
+                                                remaining())], should_stop)
+            alpha = results[0][1]
+            more, more_nodes = self._run([(i, position, root[i], depth, alpha, remaining()) for i in order[1:]],
+                                         should_stop)
+            results += more
+            nodes += eldest_nodes + more_nodes
+
+        # Exact scores decide the value; ties go to the earliest move in generation order.
+        exact = {index: value for index, value, alpha in results if value > alpha or alpha == float('-inf')}
+        best = max(exact.values())
+        chosen = min(index for index, value in exact.items() if value == best)
+        ambiguous = sorted(index for index, value, alpha in results
+                           if index not in exact and value == best and index < chosen)
+        if ambiguous:
+            checks, check_nodes = self._run([(i, position, root[i], depth, _just_below(best), remaining())
+                                             for i in ambiguous], should_stop)
+            nodes += check_nodes
+            tied = [index for index, value, alpha in checks if value > alpha]
+            if tied:
+                chosen = min(tied)
+        return best if board.turn == "RED" else -best, root[chosen], nodes + 1
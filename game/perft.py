@@ -0,0 +1,158 @@
+import argparse
+import multiprocessing
+import time
+
+from core.bitboard import BitBoard
+from core.board import Board
+from core.moves import is_jump_move, legal_moves, listed
+
+# Subtree counts are remembered by position hash and depth; the table is dropped when it grows past this.
+MEMO_ENTRIES = 1_000_000
+
+
+def perft(board, depth, memo=None):
+    if depth == 0:
+        return 1
+    moves, jumps = board.get_all_moves(board.turn, board.must_jump)
+    if depth == 1:
+        return sum(len(move_list) for move_list in jumps.values()) + \
+               sum(len(move_list) for move_list in moves.values())
+    if memo is not None:
+        key = (board.hash, depth)
+        leaves = memo.get(key)
+        if leaves is not None:
+            return leaves
+    leaves = 0
+    for move_dict, is_jump in ((jumps, True), (moves, False)):
+        for start_pos, move_list in move_dict.items():
+            for move_data in move_list:
+                undo = board.make_move(start_pos, move_data, is_jump)
+                leaves += perft(board, depth - 1, memo)
+                board.unmake_move(undo)
+    if memo is not None:
+        if len(memo) >= MEMO_ENTRIES:
+            memo.clear()
+        memo[key] = leaves
+    return leaves
+
+
+def move_name(move):
+    start_pos, move_data = move
+    if is_jump_move(move):
+        return "x".join(f"({row}, {col})" for row, col in move_data)
+    return f"({start_pos[0]}, {start_pos[1]})-({move_data[0]}, {move_data[1]})"
+
+
+_memo = None
+
+
+def _init_worker():
+    global _memo
+    _memo = {}
+
+
+def _divide_move(task):
+    index, position, move, depth = task
+    board = BitBoard(*position)
+    start_pos, move_data = move
+    board.make_move(start_pos, move_data, is_jump_move(move))
+    return index, perft(board, depth - 1, _memo)
+
+
+def divide(board, depth, processes=None):
+    moves = legal_moves(board)
+    position = (board.must_jump, board.red, board.blue, board.kings, board.turn)
+    tasks = [(index, position, move, depth) for index, move in enumerate(moves)]
+    counts = [0] * len(moves)
+    # Each worker keeps its own memo, so transpositions between root moves in one worker are shared too.
+    with multiprocessing.Pool(processes, initializer=_init_worker) as pool:
+        for index, leaves in pool.imap_unordered(_divide_move, tasks):
+            counts[index] = leaves
+    return list(zip(moves, counts))
+
+
+def _jump_errors(board, jumps):
+    errors = []
+    for start_pos, paths in jumps.items():
+        for path in paths:
+            if path[0] != start_pos or len(path) < 2:
+                errors.append(f"jump {path} does not start at {start_pos}")
+                continue
+            captured = [((row + next_row) // 2, (col + next_col) // 2)
+                        for (row, col), (next_row, next_col) in zip(path, path[1:])]
+            if any(abs(next_row - row) != 2 or abs(next_col - col) != 2
+                   for (row, col), (next_row, next_col) in zip(path, path[1:])):
+                errors.append(f"jump {path} has a step that is not a jump")
+            elif len(set(captured)) != len(captured):
+                errors.append(f"jump {path} captures the same piece twice")
+    return errors
+
+
+def validate(bitboard, depth, errors, limit=20):
+    # Walks the tree on both board implementations at once and records every disagreement.
+    board = Board.from_bitboard(bitboard)
+
+    def walk(depth):
+        if len(errors) >= limit:
+            return 0
+        moves, jumps = bitboard.get_all_moves(bitboard.turn, bitboard.must_jump)
+        board_moves, board_jumps = board.get_all_moves(board.turn, board.must_jump)
+        position = f"red={bitboard.red:#010x} blue={bitboard.blue:#010x} kings={bitboard.kings:#010x} {bitboard.turn}"
+        if board.hash != bitboard.hash:
+            errors.append(f"{position}: Board and BitBoard hashes differ")
+        if sorted(map(move_name, listed(moves, jumps))) != sorted(map(move_name, listed(board_moves, board_jumps))):
+            errors.append(f"{position}: Board and BitBoard generate different moves")
+        if bitboard.must_jump and jumps and moves:
+            errors.append(f"{position}: quiet moves offered while a capture is available")
+        errors.extend(f"{position}: {error}" for error in _jump_errors(bitboard, jumps))
+        if depth == 0:
+            return 1
+        leaves = 0
+        for move_dict, is_jump in ((jumps, True), (moves, False)):
+            for start_pos, move_list in move_dict.items():
+                for move_data in move_list:
+                    undo = bitboard.make_move(start_pos, move_data, is_jump)
+                    board_undo = board.make_move(start_pos, move_data, is_jump)
+                    leaves += walk(depth - 1)
+                    board.unmake_move(board_undo)
+                    bitboard.unmake_move(undo)
+        return leaves
+
+    return walk(depth)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count leaf nodes of the move tree to a fixed depth.")
+    parser.add_argument("depth", type=int)
+    parser.add_argument("--red", type=lambda text: int(text, 0), default=0x00000FFF, help="red piece mask")
+    parser.add_argument("--blue", type=lambda text: int(text, 0), default=0xFFF00000, help="blue piece mask")
+    parser.add_argument("--kings", type=lambda text: int(text, 0), default=0, help="king mask")
+    parser.add_argument("--turn", choices=("RED", "BLUE"), default="BLUE")
+    parser.add_argument("--no-must-jump", dest="must_jump", action="store_false")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--validate", action="store_true",
+                        help="walk the tree on Board and BitBoard and check every position instead")
+    args = parser.parse_args()
+    if args.depth < 1:
+        parser.error("depth must be at least 1")
+
+    board = BitBoard(args.must_jump, args.red, args.blue, args.kings, args.turn)
+    start = time.perf_counter()
+    if args.validate:
+        errors = []
+        leaves = validate(board, args.depth, errors)
+        for error in errors:
+            print(error)
+        print(f"Validated {leaves} leaves to depth {args.depth} in {time.perf_counter() - start:.1f}s: "
+              f"{len(errors) or 'no'} problems found.")
+        raise SystemExit(1 if errors else 0)
+    total = 0
+    for move, leaves in divide(board, args.depth, args.processes):
+        print(f"{move_name(move)}: {leaves}")
+        total += leaves
+    elapsed = time.perf_counter() - start
+    print(f"perft({args.depth}) = {total} in {elapsed:.2f}s ({total / elapsed:,.0f} leaves/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import json
+import multiprocessing
+import random
+import time
+
+from core.board import Board
+from core.moves import legal_moves, opponent, play
+from game.ai import CheckersAI
+from utils.cache import cache
+
+
+def play_game(task):
+    index, players, must_jump, seed, random_plies, max_plies = task
+    rng = random.Random(seed)
+    # Players swap colours every game so neither keeps the first move.
+    red, blue = ("A", "B") if index % 2 == 0 else ("B", "A")
+    board = Board(must_jump)
+    ais = {"RED": CheckersAI(**players[red]), "BLUE": CheckersAI(**players[blue])}
+    color = "BLUE"
+    record = []
+    winner = "DRAW"
+    while len(record) < max_plies:
+        legal = legal_moves(board, color, must_jump)
+        if not legal:
+            # Covers both a blocked side and one with no pieces left.
+            winner = opponent(color)
+            break
+        entry = {"side": color}
+        if len(record) < random_plies:
+            move = rng.choice(legal)
+            entry["random"] = True
+        else:
+            ai = ais[color]
+            ai.reset_counters()
+            search_board = ai.search_board(board)
+            start = time.perf_counter()
+            evaluation, move, depth = ai.search(search_board, ai.depth_limit(search_board), ai.time_budget_ms)
+            entry.update(evaluation=evaluation, depth=depth, nodes=ai.nodes,
+                         time_ms=round((time.perf_counter() - start) * 1000, 2))
+            if ai.collect_stats:
+                entry["stats"] = ai.last_stats
+        entry["move"] = move
+        record.append(entry)
+        play(board, move)
+        color = opponent(color)
+    for ai in ais.values():
+        ai.close()
+    result = "draw" if winner == "DRAW" else (red if winner == "RED" else blue)
+    return {"game": index, "seed": seed, "must_jump": must_jump, "red": red, "blue": blue,
+            "winner": winner, "result": result, "plies": len(record), "moves": record}
+
+
+def _init_worker():
+    # Games run in parallel, so keep evaluations in memory rather than contend for the SQLite file.
+    cache.store = None
+
+
+def run_matches(players, games, output, processes=None, must_jump=True, seed=0, random_plies=4, max_plies=200):
+    tasks = [(index, players, must_jump, seed + index, random_plies, max_plies) for index in range(games)]
+    totals = {"A": 0, "B": 0, "draw": 0}
+    with multiprocessing.Pool(processes, initializer=_init_worker) as pool, open(output, "a") as file:
+        for result in pool.imap_unordered(play_game, tasks):
+            file.write(json.dumps(result, separators=(",", ":")) + "\n")
+            file.flush()
+            totals[result["result"]] += 1
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play bot-vs-bot games without a display.")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--output", default="selfplay.jsonl")
+    parser.add_argument("--player-a", type=json.loads, default={"time_budget_ms": 100},
+                        help="CheckersAI keyword arguments as JSON")
+    parser.add_argument("--player-b", type=json.loads, default={"time_budget_ms": 100},
+                        help="CheckersAI keyword arguments as JSON")
+    parser.add_argument("--no-must-jump", dest="must_jump", action="store_false")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--random-plies", type=int, default=4)
+    parser.add_argument("--max-plies", type=int, default=200)
+    args = parser.parse_args()
+
+    # Pool workers cannot start pools of their own, so each bot searches serially.
+    players = {"A": dict(args.player_a, workers=1), "B": dict(args.player_b, workers=1)}
+    start = time.perf_counter()
+    totals = run_matches(players, args.games, args.output, args.processes, args.must_jump, args.seed,
+                         args.random_plies, args.max_plies)
+    print(f"{args.games} games in {time.perf_counter() - start:.1f}s: A won {totals['A']}, "
+          f"B won {totals['B']}, {totals['draw']} drawn. Results in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import time
+
+from utils.cache import cache
+
+
+class SearchStats:
+
+    def __init__(self, ai):
+        self.ai = ai
+        self.start = time.perf_counter()
+        self.nodes_per_ply = []
+        self.leaf_evaluations = 0
+        self.expansions = 0
+        self.moves_generated = 0
+        self.children_searched = 0
+        self.move_generation_time = 0.0
+        self.evaluation_time = 0.0
+        self.make_unmake_time = 0.0
+        # Counters owned elsewhere are reported as the change over this search.
+        self.cache_before = (cache.hits, cache.misses)
+        self.search_before = (ai.cutoffs, ai.first_move_cutoffs, ai.tt.probes, ai.tt.hits, ai.tt.cutoffs)
+
+    def attach(self):
+        # Counts every node by ply, re-searches included, by shadowing the search on this one instance.
+        ai = self.ai
+        negamax, quiescence = type(ai).negamax, type(ai).quiescence
+
+        def count(ply):
+            while ply >= len(self.nodes_per_ply):
+                self.nodes_per_ply.append(0)
+            self.nodes_per_ply[ply] += 1
+
+        def counted_negamax(board, depth, alpha, beta, ply=0):
+            # Horizon nodes of the selective search are counted by quiescence.
+            if depth or not ai.selective:
+                count(ply)
+            return negamax(ai, board, depth, alpha, beta, ply)
+
+        def counted_quiescence(board, alpha, beta, ply):
+            count(ply)
+            return quiescence(ai, board, alpha, beta, ply)
+
+        ai.negamax, ai.quiescence = counted_negamax, counted_quiescence
+
+    def detach(self):
+        del self.ai.negamax, self.ai.quiescence
+
+    def report(self, depth):
+        ai = self.ai
+        cutoffs, first_move_cutoffs, tt_probes, tt_hits, tt_cutoffs = (
+            now - before for now, before in zip((ai.cutoffs, ai.first_move_cutoffs, ai.tt.probes, ai.tt.hits,
+                                                 ai.tt.cutoffs), self.search_before))
+        return {
+            "depth": depth,
+            "nodes": sum(self.nodes_per_ply),
+            "nodes_per_ply": list(self.nodes_per_ply),
+            "leaf_evaluations": self.leaf_evaluations,
+            "cache_hits": cache.hits - self.cache_before[0],
+            "cache_misses": cache.misses - self.cache_before[1],
+            "cutoffs": cutoffs,
+            "first_move_cutoffs": first_move_cutoffs,
+            "tt_probes": tt_probes,
+            "tt_hits": tt_hits,
+            "tt_cutoffs": tt_cutoffs,
+            # Legal moves per expanded node, and how many of them were searched before a cutoff.
+            "branching_factor": self.moves_generated / self.expansions if self.expansions else 0.0,
+            "effective_branching_factor": self.children_searched / self.expansions if self.expansions else 0.0,
+            "time_ms": {
+                "total": (time.perf_counter() - self.start) * 1000,
+                "move_generation": self.move_generation_time * 1000,
+                "evaluation": self.evaluation_time * 1000,
+                "make_unmake": self.make_unmake_time * 1000,
+            },
+        }
+
+
+class InstrumentedBoard:
+    # Stands in for the search board and times the calls the search makes on it,
+    # so the uninstrumented search pays nothing for the collector.
+
+    def __init__(self, board, stats):
+        self.wrapped = board
+        self.stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped, name)
+
+    def get_all_moves(self, color, must_jump):
+        stats = self.stats
+        start = time.perf_counter()
+        moves, jumps = self.wrapped.get_all_moves(color, must_jump)
+        stats.move_generation_time += time.perf_counter() - start
+        stats.expansions += 1
+        stats.moves_generated += sum(len(move_list) for move_list in (jumps if jumps else moves).values())
+        return moves, jumps
+
+    def evaluate(self, must_jump):
+        start = time.perf_counter()
+        evaluation = self.wrapped.evaluate(must_jump)
+        self.stats.evaluation_time += time.perf_counter() - start
+        self.stats.leaf_evaluations += 1
+        return evaluation
+
+    def make_move(self, start_pos, move_data, is_jump):
+        stats = self.stats
+        start = time.perf_counter()
+        undo = self.wrapped.make_move(start_pos, move_data, is_jump)
+        stats.make_unmake_time += time.perf_counter() - start
+        stats.children_searched += 1
+        return undo
+
+    def unmake_move(self, undo):
+        start = time.perf_counter()
+        self.wrapped.unmake_move(undo)
+        self.stats.make_unmake_time += time.perf_counter() - start
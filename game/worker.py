@@ -0,0 +1,65 @@
+import threading
+
+from core.moves import is_jump_move
+
+
+class SearchWorker:
+
+    def __init__(self, ai):
+        self.ai = ai
+        self.thread = None
+        self.result = None
+        self.pondering = None
+
+    def start(self, board):
+        if self.pondering is not None:
+            if self.pondering == board.hash and self.thread is not None:
+                # The expected reply was played: the ponder search carries on as the real one.
+                self.pondering = None
+                self.ai.ponderhit()
+                return
+            # Anything else is searched afresh, with the caches the ponder search warmed.
+            self.cancel()
+        self.result = None
+        self.ai.cancelled = False
+        self.thread = threading.Thread(target=self._run, args=(self.ai.search_board(board),), daemon=True)
+        self.thread.start()
+
+    def ponder(self, board):
+        search_board = self.ai.search_board(board)
+        reply = self.ai.expected_reply(search_board)
+        if reply is None:
+            return
+        start_pos, move_data = reply
+        search_board.make_move(start_pos, move_data, is_jump_move(reply))
+        self.pondering = search_board.hash
+        self.result = None
+        self.ai.cancelled = False
+        self.thread = threading.Thread(target=self._ponder, args=(search_board,), daemon=True)
+        self.thread.start()
+
+    def _run(self, board):
+        self.result = self.ai.think(board)
+
+    def _ponder(self, board):
+        self.result = self.ai.ponder(board)
+
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def poll(self):
+        if self.thread is None or self.thread.is_alive():
+            return None
+        self.thread = None
+        return self.result
+
+    def cancel(self):
+        self.pondering = None
+        if self.thread is not None:
+            self.ai.cancelled = True
+            self.thread.join()
+            self.thread = None
+            self.ai.cancelled = False
+
+    def progress(self):
+        return self.ai.progress()
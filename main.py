@@ -1,4 +1,12 @@
-from game.logic import GameLogic
+import importlib
+import os
+import threading
+
+# The game modules and pygame load in the background while the player answers the prompts,
+# so pygame's import banner would land in the middle of them.
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+loader = threading.Thread(target=importlib.import_module, args=("game.logic",), daemon=True)
+loader.start()
 
 while True:
     choice = input("Do you want to play with mandatory takes? (y/n): ")
@@ -19,5 +27,8 @@ print("- The bot plays as RED")
 print()
 input("Press Enter to start the game...")
 
+loader.join()
+from game.logic import GameLogic
+
 game = GameLogic(must_take)
 game.start()
@@ -4,9 +4,11 @@ from core.piece import Piece
 
 class CheckersGUI:
 
-    def __init__(self, board, must_jump):
+    def __init__(self, board, must_jump, cached_rendering=True):
 
-        pygame.init()
+        # Only the display and fonts are used; audio and joystick start-up is skipped.
+        pygame.display.init()
+        pygame.font.init()
         self.BOARD_SIZE = 8
         self.SQUARE_SIZE = 100
         self.STATUS_HEIGHT = 60
@@ -32,8 +34,41 @@ class CheckersGUI:
         self.valid_moves = []
         self.valid_jumps = []
         self.current_player = "BLUE"
-        
-    def draw_board(self):
+        self.cached_rendering = cached_rendering
+        if cached_rendering:
+            self.prerender()
+        self.drawn = None
+
+    def prerender(self):
+        # Everything the cached renderer draws is built once here and only blitted afterwards.
+        self.background = pygame.Surface((self.WINDOW_SIZE, self.WINDOW_SIZE)).convert()
+        self.draw_board(self.background)
+        self.sprites = {}
+        center = (self.SQUARE_SIZE // 2, self.SQUARE_SIZE // 2)
+        for piece in (Piece.RED, Piece.RED_KING, Piece.BLUE, Piece.BLUE_KING):
+            sprite = pygame.Surface((self.SQUARE_SIZE, self.SQUARE_SIZE), pygame.SRCALPHA).convert_alpha()
+            color = self.BLUE_PIECE if Piece.is_blue(piece) else self.RED_PIECE
+            pygame.draw.circle(sprite, self.BLACK, center, self.PIECE_RADIUS + 3)
+            pygame.draw.circle(sprite, color, center, self.PIECE_RADIUS)
+            if Piece.is_king(piece):
+                self.draw_crown(*center, sprite)
+            self.sprites[piece] = sprite
+        self.selected_overlay = pygame.Surface((self.SQUARE_SIZE, self.SQUARE_SIZE), pygame.SRCALPHA).convert_alpha()
+        self.selected_overlay.fill(self.HIGHLIGHT_COLOR)
+        self.move_overlay = pygame.Surface((self.SQUARE_SIZE, self.SQUARE_SIZE), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.circle(self.move_overlay, self.VALID_MOVE_COLOR, center, self.SQUARE_SIZE // 4)
+        self.font = pygame.font.Font(None, 40)
+        self.small_font = pygame.font.Font(None, 24)
+        self.turn_texts = {}
+        self.message_surface = None
+        self.message_rect = pygame.Rect(10, 10, 0, 0)
+
+    def invalidate(self):
+        self.drawn = None
+
+    def draw_board(self, surface=None):
+        if surface is None:
+            surface = self.screen
         for row in range(self.BOARD_SIZE):
             for col in range(self.BOARD_SIZE):
                 x = col * self.SQUARE_SIZE
@@ -42,7 +77,7 @@ class CheckersGUI:
                     color = self.LIGHT_SQUARE
                 else:
                     color = self.DARK_SQUARE
-                pygame.draw.rect(self.screen, color, (x, y, self.SQUARE_SIZE, self.SQUARE_SIZE))
+                pygame.draw.rect(surface, color, (x, y, self.SQUARE_SIZE, self.SQUARE_SIZE))
                 
     def draw_pieces(self):
         for row in range(8):
@@ -60,14 +95,16 @@ class CheckersGUI:
                     if Piece.is_king(piece):
                         self.draw_crown(x, y)
                         
-    def draw_crown(self, x, y):
+    def draw_crown(self, x, y, surface=None):
+        if surface is None:
+            surface = self.screen
         crown_color = (255, 215, 0)
         crown_width = self.CROWN_SIZE * 2
         crown_height = self.CROWN_SIZE
         points = [(x - crown_width // 2, y + crown_height // 2), (x - crown_width // 4, y - crown_height // 2), 
                   (x, y + crown_height // 2), (x + crown_width // 4, y - crown_height // 2), (x + crown_width // 2, y + crown_height // 2)]
-        pygame.draw.polygon(self.screen, crown_color, points)
-        pygame.draw.polygon(self.screen, self.BLACK, points, 2)
+        pygame.draw.polygon(surface, crown_color, points)
+        pygame.draw.polygon(surface, self.BLACK, points, 2)
         
     def draw_highlights(self):
         if self.selected_piece:
@@ -107,12 +144,72 @@ class CheckersGUI:
             self.screen.blit(msg_surface, (10, 10))
             
     def render(self, message=""):
-        self.draw_board()
-        self.draw_highlights()
-        self.draw_pieces()
-        self.draw_status(message)
-        pygame.display.flip()
+        if self.cached_rendering:
+            self.render_changes(message)
+        else:
+            self.draw_board()
+            self.draw_highlights()
+            self.draw_pieces()
+            self.draw_status(message)
+            pygame.display.flip()
         self.clock.tick(60)
+
+    def square_rect(self, row, col):
+        return pygame.Rect(col * self.SQUARE_SIZE, row * self.SQUARE_SIZE, self.SQUARE_SIZE, self.SQUARE_SIZE)
+
+    def squares_under(self, rect):
+        return {(row, col) for row in range(rect.top // self.SQUARE_SIZE, min(rect.bottom // self.SQUARE_SIZE + 1, 8))
+                for col in range(rect.left // self.SQUARE_SIZE, min(rect.right // self.SQUARE_SIZE + 1, 8))}
+
+    def render_changes(self, message=""):
+        # Only squares whose piece or highlight changed are redrawn; an unchanged frame draws nothing.
+        targets = set(self.valid_moves)
+        targets.update(jump_sequence[-1] for jump_sequence in self.valid_jumps)
+        squares = [[(self.board.board[row][col], (row, col) == self.selected_piece, (row, col) in targets)
+                    for col in range(8)] for row in range(8)]
+        if self.drawn is None:
+            dirty = {(row, col) for row in range(8) for col in range(8)}
+            drawn_squares, drawn_player, drawn_message = None, None, None
+        else:
+            drawn_squares, drawn_player, drawn_message = self.drawn
+            dirty = {(row, col) for row in range(8) for col in range(8) if squares[row][col] != drawn_squares[row][col]}
+        updated = []
+        if message != drawn_message:
+            # The message is drawn over the board, so the squares under the old and new text are repainted.
+            dirty |= self.squares_under(self.message_rect)
+            updated.append(self.message_rect)
+            self.message_surface = self.small_font.render(message, True, self.BLACK) if message else None
+            self.message_rect = pygame.Rect((10, 10), self.message_surface.get_size() if message else (0, 0))
+            dirty |= self.squares_under(self.message_rect)
+            updated.append(self.message_rect)
+        for row, col in dirty:
+            piece, selected, target = squares[row][col]
+            rect = self.square_rect(row, col)
+            self.screen.blit(self.background, rect, rect)
+            if selected:
+                self.screen.blit(self.selected_overlay, rect)
+            if target:
+                self.screen.blit(self.move_overlay, rect)
+            if piece != Piece.EMPTY:
+                self.screen.blit(self.sprites[piece], rect)
+            updated.append(rect)
+        if self.message_surface is not None and dirty & self.squares_under(self.message_rect):
+            self.screen.blit(self.message_surface, self.message_rect)
+        if self.current_player != drawn_player:
+            updated.append(self.draw_turn())
+        if updated:
+            pygame.display.update(updated)
+        self.drawn = (squares, self.current_player, message)
+
+    def draw_turn(self):
+        status_rect = pygame.Rect(0, self.WINDOW_SIZE, self.WINDOW_SIZE, self.STATUS_HEIGHT)
+        self.screen.fill((200, 200, 200), status_rect)
+        text_surface = self.turn_texts.get(self.current_player)
+        if text_surface is None:
+            text_surface = self.font.render(f"{self.current_player}'s Turn", True, self.BLACK)
+            self.turn_texts[self.current_player] = text_surface
+        self.screen.blit(text_surface, text_surface.get_rect(center=status_rect.center))
+        return status_rect
         
     def get_clicked_square(self, mouse_pos):
         x, y = mouse_pos
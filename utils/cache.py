@@ -1,24 +1,226 @@
 import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from core.piece import cache_key_to_board
+from core.zobrist import hash_board
 
 CACHE_FILE = os.path.join("data", "cache.txt")
+CACHE_DB = os.path.join("data", "cache.db")
 
-def load_cache():
-    cache = {}
-    if not os.path.exists(CACHE_FILE):
-        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
-        return cache
-    with open(CACHE_FILE, "r") as file:
+
+def _signed(key):
+    # SQLite integers are signed 64-bit; Zobrist keys are unsigned.
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+class EvaluationStore:
+    # One bit per slot, indexed by the low bits of the key. A clear bit means the key is not stored, so
+    # most misses skip the SELECT. 2**24 bits take 2 MB and give about 3% false positives at 500k rows.
+    FILTER_BITS = 1 << 24
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = None
+        self.pid = None
+        self.filter = None
+
+    def _db(self):
+        # Connections must not cross a fork, so each process opens its own.
+        if self.connection is None or self.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations "
+                "(hash INTEGER PRIMARY KEY, evaluation REAL NOT NULL, must_jump INTEGER NOT NULL) WITHOUT ROWID")
+            self.pid = os.getpid()
+        return self.connection
+
+    def load_filter(self):
+        # Uses a connection of its own so it can run on a background thread. Until it is done every
+        # lookup goes to SQLite.
+        bits = bytearray(self.FILTER_BITS // 8)
+        if os.path.exists(self.path):
+            connection = sqlite3.connect(self.path)
+            try:
+                for (key,) in connection.execute("SELECT hash FROM evaluations"):
+                    slot = key & (self.FILTER_BITS - 1)
+                    bits[slot >> 3] |= 1 << (slot & 7)
+            except sqlite3.OperationalError:
+                pass
+            connection.close()
+        self.filter = bits
+
+    def get(self, key):
+        if self.filter is not None:
+            slot = key & (self.FILTER_BITS - 1)
+            if not self.filter[slot >> 3] >> (slot & 7) & 1:
+                return None
+        row = self._db().execute("SELECT evaluation, must_jump FROM evaluations WHERE hash = ?",
+                                 (_signed(key),)).fetchone()
+        if row is None:
+            return None
+        return row[0], bool(row[1])
+
+    def add(self, entries):
+        entries = list(entries)
+        connection = self._db()
+        with connection:
+            connection.executemany("INSERT OR IGNORE INTO evaluations VALUES (?, ?, ?)",
+                                   ((_signed(key), evaluation, int(must_jump))
+                                    for key, (evaluation, must_jump) in entries))
+        if self.filter is not None:
+            for key, _ in entries:
+                slot = key & (self.FILTER_BITS - 1)
+                self.filter[slot >> 3] |= 1 << (slot & 7)
+
+    def __len__(self):
+        return self._db().execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+
+
+class EvaluationCache:
+    # Roughly 220 bytes per entry in CPython, so the default stays under ~50 MB.
+    DEFAULT_MAX_ENTRIES = 200_000
+    FLUSH_THRESHOLD = 10_000
+
+    def __init__(self, store=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.store = store
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.pending = {}
+        self.incoming = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self.entries), "max_entries": self.max_entries}
+
+    def _remember(self, key, value):
+        self.entries[key] = value
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+        if self.store is not None:
+            value = self.pending.get(key)
+            if value is None:
+                value = self.store.get(key)
+            if value is not None:
+                self._remember(key, value)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        if key in self.entries:
+            return
+        self._remember(key, value)
+        if self.store is not None:
+            self.pending[key] = value
+            if len(self.pending) >= self.FLUSH_THRESHOLD:
+                self.flush()
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def attach(self, store):
+        # Called from the migration thread, which must not touch the entries a search may be changing.
+        # The thread that owns the cache takes the store over on its next flush.
+        self.incoming = store
+
+    def clear(self):
+        self.entries.clear()
+        self.pending.clear()
+
+    def flush(self):
+        if self.incoming is not None:
+            # Evaluations made before the store was ready are written to it now.
+            self.pending.update(self.entries)
+            self.store, self.incoming = self.incoming, None
+        if self.store is not None and self.pending:
+            self.store.add(self.pending.items())
+        self.pending = {}
+
+
+def read_text_cache(path):
+    entries = {}
+    with open(path, "r") as file:
         for line in file:
             key, evaluation, must_jump = line.split("|")
-            cache[key] = (float(evaluation), must_jump)
-    return cache
+            must_jump = must_jump.strip() == "True"
+            if key.isdigit():
+                entries[int(key)] = (float(evaluation), must_jump)
+            else:
+                # Older caches are keyed by board string, without side to move.
+                board = cache_key_to_board(key)
+                for turn in ("RED", "BLUE"):
+                    entries[hash_board(board, turn, must_jump)] = (float(evaluation), must_jump)
+    return entries
+
+
+def import_text_cache(text_path=CACHE_FILE, db_path=CACHE_DB):
+    store = EvaluationStore(db_path)
+    entries = read_text_cache(text_path)
+    store.add(entries.items())
+    return len(entries)
+
+
+def _migrate(cache):
+    # Written under a temporary name so an interrupted import is redone on the next run.
+    partial = CACHE_DB + ".partial"
+    if os.path.exists(partial):
+        os.remove(partial)
+    import_text_cache(CACHE_FILE, partial)
+    os.replace(partial, CACHE_DB)
+    store = EvaluationStore(CACHE_DB)
+    store.load_filter()
+    cache.attach(store)
+
+
+def open_cache():
+    # The SQLite store connects on first use. The one-time migration of the old text cache runs in
+    # the background, and the in-memory cache serves searches until it is done.
+    if not os.path.exists(CACHE_DB) and os.path.exists(CACHE_FILE):
+        cache = EvaluationCache()
+        threading.Thread(target=_migrate, args=(cache,), daemon=True).start()
+        return cache
+    store = EvaluationStore(CACHE_DB)
+    threading.Thread(target=store.load_filter, daemon=True).start()
+    return EvaluationCache(store)
+
+
+def save_cache(cache):
+    cache.flush()
 
 
-def save_cache(cache, must_jump):
-    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
-    with open(CACHE_FILE, "w") as file:
-        for key in cache:
-            file.write(f"{key}|{cache[key][0]}|{must_jump}\n")
+cache = open_cache()
 
 
-cache = load_cache()
+if __name__ == "__main__":
+    import sys
+    print(f"Imported {import_text_cache(*sys.argv[1:3])} evaluations into the binary cache.")